@@ -1,17 +1,151 @@
 class SearchResult:
+    # Slotted so sweeps that keep many results don't pay for a __dict__ per result
+    __slots__ = ('found', '_path', '_explored', '_source', '_node', 'history',
+                 '_frontier_history', '_total_nodes_explored', '_path_length',
+                 'dynamic_obstacles_encountered', 'replans', 'stats', 'cells_scanned')
+    
     def __init__(self, found, path, explored, frontier_history):
         self.found = found
-        self.path = path
-        self.explored = explored
-        self.frontier_history = frontier_history
-        self.total_nodes_explored = len(explored)
-        self.dynamic_obstacles_encountered = []
+        self._path = path
+        self._explored = explored
+        # Search whose arrays build path / explored on first access (see deferred)
+        self._source = None
+        self._node = -1
+        # Either a ready list of frontier sets or a recorder that rebuilds them on demand
+        self.history = frontier_history
+        self._frontier_history = frontier_history if isinstance(frontier_history, list) else None
+        self._total_nodes_explored = len(explored) if explored is not None else None
+        self._path_length = None
+        self.dynamic_obstacles_encountered = ()
+        self.replans = ()
+        # SearchStats when the run was instrumented, otherwise None
+        self.stats = None
+        # Cells stepped on while jumping (JPS only); explored then holds just the jump points
+        self.cells_scanned = None
+    
+    @classmethod
+    def deferred(cls, found, source, node, frontier_history):
+        # Keeps a reference to the search instead of building sets and tuples up front;
+        # source provides reconstruct_path(node), path_length(node), explored_cells()
+        # and explored_count()
+        result = cls(found, None if found else [], None, frontier_history)
+        result._source = source
+        result._node = node
+        return result
+    
+    def _require_source(self, what):
+        if self._source is None:
+            raise ValueError(f"{what} is not available: this result only keeps counts")
+        return self._source
+    
+    def _release_source(self):
+        # Once path and explored both exist the search's arrays are no longer needed
+        if self._path is not None and self._explored is not None:
+            self._source = None
+    
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = self._require_source('path').reconstruct_path(self._node)
+            self._release_source()
+        return self._path
+    
+    @property
+    def explored(self):
+        if self._explored is None:
+            self._explored = self._require_source('explored').explored_cells()
+            self._release_source()
+        return self._explored
+    
+    @property
+    def total_nodes_explored(self):
+        if self._total_nodes_explored is None:
+            self._total_nodes_explored = self._require_source('explored').explored_count()
+        return self._total_nodes_explored
+    
+    @total_nodes_explored.setter
+    def total_nodes_explored(self, value):
+        self._total_nodes_explored = value
+    
+    @property
+    def path_length(self):
+        # Number of cells on the path, without building the path when it isn't built yet
+        if self._path_length is not None:
+            return self._path_length
+        if self._path is not None:
+            return len(self._path)
+        return self._require_source('path').path_length(self._node)
+    
+    def source_bytes(self):
+        # Bytes of the flat arrays (bytearray, array, numpy) a deferred result keeps alive
+        # through its search; 0 once path and explored are built or counts_only dropped them
+        if self._source is None:
+            return 0
+        total = 0
+        for value in vars(self._source).values():
+            try:
+                total += memoryview(value).nbytes
+            except TypeError:
+                pass
+        return total
+    
+    def counts_only(self):
+        # Drops path, explored, history and the search reference; found and the counts stay
+        self._total_nodes_explored = self.total_nodes_explored
+        self._path_length = self.path_length
+        self._path = self._explored = self._source = None
+        self.history = self._frontier_history = []
+        return self
+    
+    @property
+    def frontier_history(self):
+        if self._frontier_history is None:
+            self._frontier_history = list(self.history.snapshots())
+        return self._frontier_history
+    
+    @frontier_history.setter
+    def frontier_history(self, value):
+        self.history = value
+        self._frontier_history = value
+    
+    def iter_frontier_history(self):
+        if self._frontier_history is not None:
+            return iter(self._frontier_history)
+        return self.history.snapshots()
+    
+    def frontier_events(self):
+        # Raw (PUSH/POP, node) events for recorders that keep them, otherwise None
+        events = getattr(self.history, 'events', None)
+        return events() if events is not None else None
+    
+    def replay_frontier(self):
+        # (popped node, live frontier) steps for recorders that keep push/pop events
+        replay = getattr(self.history, 'replay', None)
+        return replay() if replay is not None else None
 
+from .history import NullRecorder, SampledRecorder, DeltaRecorder
 from .bfs import BFS
 from .dfs import DFS
 from .ucs import UCS
 from .dls import DLS
 from .iddfs import IDDFS
 from .bidirectional import BidirectionalSearch
+from .wavefront import WavefrontBFS, wavefront_distance_field
+from .batch import BatchBFS
+from .dstar_lite import DStarLite
+from .instrumentation import SearchStats, run_instrumented
+from .stepping import SearchStepper
+from .compact import (CompactBFS, CompactDFS, CompactUCS, CompactDLS,
+                      CompactIDDFS, CompactBidirectionalSearch)
+from .landmarks import LandmarkTable, LandmarkSearch
+from .jps import JPS
+from .hierarchical import ClusterGraph, HierarchicalSearch
+from .fields import distance_field
+from .registry import ALGORITHMS
 
-__all__ = ['SearchResult', 'BFS', 'DFS', 'UCS', 'DLS', 'IDDFS', 'BidirectionalSearch']
+__all__ = ['SearchResult', 'BFS', 'DFS', 'UCS', 'DLS', 'IDDFS', 'BidirectionalSearch',
+           'CompactBFS', 'CompactDFS', 'CompactUCS', 'CompactDLS', 'CompactIDDFS',
+           'CompactBidirectionalSearch', 'NullRecorder', 'SampledRecorder', 'DeltaRecorder',
+           'WavefrontBFS', 'BatchBFS', 'DStarLite', 'SearchStats', 'run_instrumented',
+           'SearchStepper', 'LandmarkTable', 'LandmarkSearch', 'JPS', 'ClusterGraph',
+           'HierarchicalSearch', 'distance_field', 'wavefront_distance_field', 'ALGORITHMS']
@@ -0,0 +1,86 @@
+from array import array
+from collections import deque
+from . import SearchResult
+
+
+class BatchBFS:
+    def __init__(self, grid, counts_only=False):
+        self.grid = grid
+        # counts_only: results keep found, path length and expansions, not the path itself
+        self.counts_only = counts_only
+        size = grid.width * grid.height
+        self.parent = array('i', [-1]) * size
+        # Tree id that last visited each cell; lets every tree reuse the same arrays without clearing
+        self.stamp = array('i', [0]) * size
+        self.trees = 0
+
+    def search_many(self, queries):
+        # Group queries by source so each distinct source costs a single traversal
+        groups = {}
+        for query_index, (start, target) in enumerate(queries):
+            groups.setdefault(tuple(start), []).append((query_index, tuple(target)))
+
+        for source, items in groups.items():
+            yield from self.search_tree(source, items)
+
+    def search_tree(self, source, items):
+        grid = self.grid
+        parent, stamp = self.parent, self.stamp
+        neighbor_ids = grid.neighbor_ids
+
+        pending = {}
+        for query_index, target in items:
+            # Component labels reject unreachable targets without growing the tree
+            if grid.is_reachable(source, target):
+                pending.setdefault(grid.index(target), []).append(query_index)
+            else:
+                yield query_index, self.make_result(False, -1, 0)
+
+        if not pending:
+            return
+
+        self.trees += 1
+        tree = self.trees
+        start = grid.index(source)
+        parent[start] = -1
+        stamp[start] = tree
+        frontier = deque([start])
+        expanded = 0
+
+        while frontier and pending:
+            node = frontier.popleft()
+            expanded += 1
+
+            # Stream results as soon as the traversal reaches each requested target
+            query_indices = pending.pop(node, None)
+            if query_indices is not None:
+                for query_index in query_indices:
+                    yield query_index, self.make_result(True, node, expanded)
+
+            for neighbor in neighbor_ids(node):
+                if stamp[neighbor] != tree:
+                    stamp[neighbor] = tree
+                    parent[neighbor] = node
+                    frontier.append(neighbor)
+
+        for query_indices in pending.values():
+            for query_index in query_indices:
+                yield query_index, self.make_result(False, -1, expanded)
+
+    def reconstruct_path(self, node):
+        path = []
+        current = node
+        while current != -1:
+            path.append(current)
+            current = self.parent[current]
+        path.reverse()
+        position = self.grid.position
+        return [position(node) for node in path]
+
+    def make_result(self, found, node, expanded):
+        # The BFS tree is shared by every query from the same source, so results only
+        # carry the path and the number of expansions made before the target was reached
+        path = self.reconstruct_path(node) if found else []
+        result = SearchResult(found, path, set(), [])
+        result.total_nodes_explored = expanded
+        return result.counts_only() if self.counts_only else result
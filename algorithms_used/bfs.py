@@ -1,32 +1,62 @@
 from collections import deque
 from . import SearchResult
+from .history import DeltaRecorder
+from .stepping import EXPAND, PUSH, FOUND, SearchStepper, drain
 
 class BFS:
-    def __init__(self, grid):
+    def __init__(self, grid, recorder=None, sources=None, targets=None):
         self.grid = grid
         self.explored = set()
         self.parent = {}
-        self.frontier_history = []
+        self.recorder = recorder if recorder is not None else DeltaRecorder()
+        # Optional position sets replacing grid.start / grid.target: one traversal from all
+        # sources ends at the nearest target (the last cell of the path)
+        self.sources = sources
+        self.targets = targets
     
     def search(self):
-        frontier = deque([self.grid.start])
-        in_frontier = {self.grid.start}
-        self.parent[self.grid.start] = None
+        return drain(self._run(False))
+    
+    def stepper(self):
+        return SearchStepper(self)
+    
+    def _run(self, emit):
+        # Generator behind search() and stepper(); yields events only when emit is set
+        sources = [self.grid.start] if self.sources is None else list(self.sources)
+        targets = {self.grid.target} if self.targets is None else set(self.targets)
+        if not self.grid.any_reachable(sources, targets):
+            # Sources and targets lie in different components: no search needed
+            return SearchResult(False, [], self.explored, self.recorder)
+        
+        frontier = deque()
+        in_frontier = set()
+        for source in sources:
+            if source in in_frontier or self.grid.is_blocked(source):
+                continue
+            frontier.append(source)
+            in_frontier.add(source)
+            self.parent[source] = None
+            self.recorder.push(source)
+            if emit:
+                yield PUSH, source
         
         while frontier:
-            self.frontier_history.append(set(frontier))
-            
             node = frontier.popleft()
+            self.recorder.pop(node)
             in_frontier.discard(node)
             
             if node in self.explored:
                 continue
             
             self.explored.add(node)
+            if emit:
+                yield EXPAND, node
             
-            if node == self.grid.target:
+            if node in targets:
                 path = self.reconstruct_path(node)
-                return SearchResult(True, path, self.explored, self.frontier_history)
+                if emit:
+                    yield FOUND, path
+                return SearchResult(True, path, self.explored, self.recorder)
             
             neighbors = self.grid.get_neighbors(node)
             for neighbor in neighbors:
@@ -34,8 +64,11 @@ class BFS:
                     self.parent[neighbor] = node
                     frontier.append(neighbor)
                     in_frontier.add(neighbor)
+                    self.recorder.push(neighbor)
+                    if emit:
+                        yield PUSH, neighbor
         
-        return SearchResult(False, [], self.explored, self.frontier_history)
+        return SearchResult(False, [], self.explored, self.recorder)
     
     def reconstruct_path(self, node):
         path = []
@@ -1,64 +1,101 @@
-from collections import deque
 from . import SearchResult
+from .history import NullRecorder
+from .stepping import EXPAND, PUSH, FOUND, SearchStepper, drain
 
 class BidirectionalSearch:
-    def __init__(self, grid):
+    def __init__(self, grid, recorder=None, sources=None, targets=None):
         self.grid = grid
-        self.explored_forward = set()
-        self.explored_backward = set()
+        # Nodes expanded by either side; a node is never expanded by both
+        self.explored = set()
         self.parent_forward = {}
         self.parent_backward = {}
-        self.frontier_history = []
+        self.recorder = recorder if recorder is not None else NullRecorder()
+        # Optional position sets replacing grid.start / grid.target: the forward side grows
+        # from every source, the backward side from every target
+        self.sources = sources
+        self.targets = targets
     
     def search(self):
-        frontier_f = deque([self.grid.start])
-        frontier_b = deque([self.grid.target])
+        return drain(self._run(False))
+    
+    def stepper(self):
+        return SearchStepper(self)
+    
+    def _run(self, emit):
+        # Generator behind search() and stepper(); yields events only when emit is set
+        grid = self.grid
+        sources = [grid.start] if self.sources is None else list(self.sources)
+        targets = [grid.target] if self.targets is None else list(self.targets)
+        if not grid.any_reachable(sources, targets):
+            # Sources and targets lie in different components: no search needed
+            return SearchResult(False, [], self.explored, self.recorder)
         
-        in_frontier_f = {self.grid.start}
-        in_frontier_b = {self.grid.target}
+        parent_f, parent_b = self.parent_forward, self.parent_backward
+        layer_f = yield from self.seed(sources, parent_f, emit)
+        layer_b = yield from self.seed(targets, parent_b, emit)
         
-        self.parent_forward[self.grid.start] = None
-        self.parent_backward[self.grid.target] = None
+        for start in layer_f:
+            if start in parent_b:
+                self.recorder.pop(start)
+                self.explored.add(start)
+                if emit:
+                    yield EXPAND, start
+                    yield FOUND, [start]
+                return SearchResult(True, [start], self.explored, self.recorder)
+        
+        # Whole layers are expanded, always on the side with the smaller frontier. A node is
+        # checked against the other side as soon as it is generated; with both sides grown
+        # layer by layer, the first such meeting already lies on a shortest path.
+        while layer_f and layer_b:
+            if len(layer_f) <= len(layer_b):
+                layer_f, meeting = yield from self.expand_layer(layer_f, parent_f, parent_b, emit)
+            else:
+                layer_b, meeting = yield from self.expand_layer(layer_b, parent_b, parent_f, emit)
+            
+            if meeting is not None:
+                path = self.reconstruct_path(meeting)
+                if emit:
+                    yield FOUND, path
+                return SearchResult(True, path, self.explored, self.recorder)
+        
+        return SearchResult(False, [], self.explored, self.recorder)
+    
+    def seed(self, cells, parent, emit=False):
+        layer = []
+        for cell in cells:
+            if cell in parent or self.grid.is_blocked(cell):
+                continue
+            parent[cell] = None
+            layer.append(cell)
+            self.recorder.push(cell)
+            if emit:
+                yield PUSH, cell
+        return layer
+    
+    def expand_layer(self, layer, parent, other_parent, emit=False):
+        get_neighbors = self.grid.get_neighbors
+        explored = self.explored
+        recorder = self.recorder
+        next_layer = []
         
-        while frontier_f or frontier_b:
-            if frontier_f:
-                node_f = frontier_f.popleft()
-                in_frontier_f.discard(node_f)
-                
-                if node_f in self.explored_backward:
-                    path = self.reconstruct_path(node_f)
-                    explored = self.explored_forward | self.explored_backward
-                    return SearchResult(True, path, explored, self.frontier_history)
-                
-                self.explored_forward.add(node_f)
-                
-                neighbors = self.grid.get_neighbors(node_f)
-                for neighbor in neighbors:
-                    if neighbor not in self.explored_forward and neighbor not in in_frontier_f:
-                        self.parent_forward[neighbor] = node_f
-                        frontier_f.append(neighbor)
-                        in_frontier_f.add(neighbor)
+        for node in layer:
+            recorder.pop(node)
+            explored.add(node)
+            if emit:
+                yield EXPAND, node
             
-            if frontier_b:
-                node_b = frontier_b.popleft()
-                in_frontier_b.discard(node_b)
-                
-                if node_b in self.explored_forward:
-                    path = self.reconstruct_path(node_b)
-                    explored = self.explored_forward | self.explored_backward
-                    return SearchResult(True, path, explored, self.frontier_history)
-                
-                self.explored_backward.add(node_b)
-                
-                neighbors = self.grid.get_neighbors(node_b)
-                for neighbor in neighbors:
-                    if neighbor not in self.explored_backward and neighbor not in in_frontier_b:
-                        self.parent_backward[neighbor] = node_b
-                        frontier_b.append(neighbor)
-                        in_frontier_b.add(neighbor)
+            for neighbor in get_neighbors(node):
+                if neighbor in parent:
+                    continue
+                parent[neighbor] = node
+                if neighbor in other_parent:
+                    return next_layer, neighbor
+                next_layer.append(neighbor)
+                recorder.push(neighbor)
+                if emit:
+                    yield PUSH, neighbor
         
-        explored = self.explored_forward | self.explored_backward
-        return SearchResult(False, [], explored, self.frontier_history)
+        return next_layer, None
     
     def reconstruct_path(self, meeting_point):
         path_f = []
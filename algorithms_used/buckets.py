@@ -0,0 +1,30 @@
+# Monotone priority queue for small non-negative integer costs (Dial's algorithm).
+# Pending costs always lie within max_step of the current cost, so a ring of
+# max_step + 1 FIFO buckets holds them; push and pop are O(1) amortized.
+class BucketQueue:
+    def __init__(self, max_step):
+        self.size = max_step + 1
+        self.buckets = [[] for _ in range(self.size)]
+        self.cost = 0
+        self.head = 0
+        self.count = 0
+
+    def push(self, cost, item):
+        self.buckets[cost % self.size].append(item)
+        self.count += 1
+
+    def pop(self):
+        buckets, size = self.buckets, self.size
+        bucket = buckets[self.cost % size]
+        while self.head >= len(bucket):
+            bucket.clear()
+            self.head = 0
+            self.cost += 1
+            bucket = buckets[self.cost % size]
+        item = bucket[self.head]
+        self.head += 1
+        self.count -= 1
+        return self.cost, item
+
+    def __len__(self):
+        return self.count
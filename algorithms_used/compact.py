@@ -0,0 +1,419 @@
+from array import array
+from collections import deque
+from . import SearchResult
+from .buckets import BucketQueue
+from .history import NullRecorder
+
+# Per-cell flag bits kept in one bytearray
+VISITED = 1
+IN_FRONTIER = 2
+
+
+class _CompactSearch:
+    def __init__(self, grid, recorder=None):
+        self.grid = grid
+        size = grid.width * grid.height
+        self.flags = bytearray(size)
+        self.parent = array('i', [-1]) * size
+        self.order = array('i')
+        # Recorded nodes are cell ids; the recorder turns them back into positions on replay
+        self.recorder = recorder if recorder is not None else NullRecorder()
+        if recorder is not None:
+            recorder.decode = grid.position
+
+    def explored_positions(self, order):
+        position = self.grid.position
+        return {position(node) for node in order}
+
+    def reconstruct_path(self, node):
+        path = []
+        current = node
+        while current != -1:
+            path.append(current)
+            current = self.parent[current]
+        path.reverse()
+        position = self.grid.position
+        return [position(node) for node in path]
+
+    def path_length(self, node):
+        length = 0
+        current = node
+        while current != -1:
+            length += 1
+            current = self.parent[current]
+        return length
+
+    def explored_cells(self):
+        return self.explored_positions(self.order)
+
+    def explored_count(self):
+        return len(self.order)
+
+    def make_result(self, found, node):
+        # Path and explored positions are only built from the arrays when accessed
+        return SearchResult.deferred(found, self, node, self.recorder)
+
+
+class CompactBFS(_CompactSearch):
+    def search(self):
+        grid = self.grid
+        if not grid.is_reachable(grid.start, grid.target):
+            return self.make_result(False, -1)
+
+        start = grid.index(grid.start)
+        target = grid.index(grid.target)
+        flags, parent, order = self.flags, self.parent, self.order
+        neighbor_ids = grid.neighbor_ids
+        recorder = self.recorder
+
+        frontier = deque([start])
+        flags[start] = IN_FRONTIER
+        recorder.push(start)
+
+        while frontier:
+            node = frontier.popleft()
+            recorder.pop(node)
+
+            if flags[node] & VISITED:
+                continue
+
+            flags[node] = VISITED
+            order.append(node)
+
+            if node == target:
+                return self.make_result(True, node)
+
+            for neighbor in neighbor_ids(node):
+                if not flags[neighbor]:
+                    parent[neighbor] = node
+                    frontier.append(neighbor)
+                    flags[neighbor] = IN_FRONTIER
+                    recorder.push(neighbor)
+
+        return self.make_result(False, -1)
+
+
+class CompactDFS(_CompactSearch):
+    def search(self):
+        grid = self.grid
+        if not grid.is_reachable(grid.start, grid.target):
+            return self.make_result(False, -1)
+
+        start = grid.index(grid.start)
+        target = grid.index(grid.target)
+        flags, parent, order = self.flags, self.parent, self.order
+        neighbor_ids = grid.neighbor_ids
+        recorder = self.recorder
+
+        frontier = [start]
+        flags[start] = IN_FRONTIER
+        recorder.push(start)
+
+        while frontier:
+            node = frontier.pop()
+            recorder.pop(node)
+
+            if flags[node] & VISITED:
+                continue
+
+            flags[node] = VISITED
+            order.append(node)
+
+            if node == target:
+                return self.make_result(True, node)
+
+            for neighbor in reversed(neighbor_ids(node)):
+                if not flags[neighbor]:
+                    parent[neighbor] = node
+                    frontier.append(neighbor)
+                    flags[neighbor] = IN_FRONTIER
+                    recorder.push(neighbor)
+
+        return self.make_result(False, -1)
+
+
+class CompactUCS(_CompactSearch):
+    def __init__(self, grid, recorder=None):
+        super().__init__(grid, recorder)
+        # Cheapest known cost per cell, valid where the IN_FRONTIER or VISITED flag is set
+        self.cost = array('q', [0]) * (grid.width * grid.height)
+
+    def search(self):
+        grid = self.grid
+        if not grid.is_reachable(grid.start, grid.target):
+            return self.make_result(False, -1)
+
+        start = grid.index(grid.start)
+        target = grid.index(grid.target)
+        flags, parent, order, best = self.flags, self.parent, self.order, self.cost
+        neighbor_ids = grid.neighbor_ids
+        recorder = self.recorder
+
+        uniform = grid.is_uniform_cost()
+        width, cell_costs = grid.width, grid.cost
+        straight, diagonal = grid.straight_cost, grid.diagonal_cost
+
+        frontier = BucketQueue(grid.max_step_cost())
+        frontier.push(0, start)
+        best[start] = 0
+        flags[start] = IN_FRONTIER
+        recorder.push(start)
+
+        while frontier:
+            cost, node = frontier.pop()
+            recorder.pop(node)
+
+            # Stale entry: the cell was already settled through a cheaper route
+            if flags[node] & VISITED:
+                continue
+
+            flags[node] = VISITED
+            order.append(node)
+
+            if node == target:
+                return self.make_result(True, node)
+
+            y, x = divmod(node, width)
+            for neighbor in neighbor_ids(node):
+                flag = flags[neighbor]
+                if flag & VISITED:
+                    continue
+                if uniform:
+                    new_cost = cost + 1
+                else:
+                    ny, nx = divmod(neighbor, width)
+                    step = diagonal if nx != x and ny != y else straight
+                    new_cost = cost + cell_costs[neighbor] * step
+                if not flag or new_cost < best[neighbor]:
+                    best[neighbor] = new_cost
+                    parent[neighbor] = node
+                    frontier.push(new_cost, neighbor)
+                    flags[neighbor] = IN_FRONTIER
+                    recorder.push(neighbor)
+
+        return self.make_result(False, -1)
+
+
+class CompactDLS(_CompactSearch):
+    def __init__(self, grid, depth_limit=150, recorder=None):
+        super().__init__(grid, recorder)
+        self.depth_limit = depth_limit
+        self.depth = array('i', [0]) * (grid.width * grid.height)
+
+    def search(self):
+        grid = self.grid
+        if not grid.is_reachable(grid.start, grid.target):
+            return self.make_result(False, -1)
+
+        start = grid.index(grid.start)
+        target = grid.index(grid.target)
+        flags, parent, order, depth = self.flags, self.parent, self.order, self.depth
+        neighbor_ids = grid.neighbor_ids
+        recorder = self.recorder
+
+        frontier = [start]
+        flags[start] = IN_FRONTIER
+        recorder.push(start)
+
+        while frontier:
+            node = frontier.pop()
+            recorder.pop(node)
+
+            if flags[node] & VISITED:
+                continue
+
+            flags[node] = VISITED
+            order.append(node)
+
+            if node == target:
+                return self.make_result(True, node)
+
+            if depth[node] < self.depth_limit:
+                for neighbor in reversed(neighbor_ids(node)):
+                    if not flags[neighbor]:
+                        parent[neighbor] = node
+                        depth[neighbor] = depth[node] + 1
+                        frontier.append(neighbor)
+                        flags[neighbor] = IN_FRONTIER
+                        recorder.push(neighbor)
+
+        return self.make_result(False, -1)
+
+
+class CompactIDDFS(_CompactSearch):
+    def __init__(self, grid, recorder=None):
+        super().__init__(grid, recorder)
+        size = grid.width * grid.height
+        # Shallowest depth per cell in the current iteration, valid only where stamp == limit
+        self.stamp = array('i', [0]) * size
+        self.depth = array('i', [0]) * size
+        self.path = []
+
+    def search(self):
+        if not self.grid.is_reachable(self.grid.start, self.grid.target):
+            return self.make_result(False, -1)
+
+        (sx, sy), (tx, ty) = self.grid.start, self.grid.target
+        first_limit = max(1, abs(sx - tx), abs(sy - ty))
+        max_depth = self.grid.width * self.grid.height
+
+        for limit in range(first_limit, max_depth + 1):
+            node, cutoff = self.depth_limited(limit)
+
+            if node != -1:
+                return self.make_result(True, node)
+
+            if not cutoff:
+                break
+
+        return self.make_result(False, -1)
+
+    def depth_limited(self, limit):
+        grid = self.grid
+        start = grid.index(grid.start)
+        target = grid.index(grid.target)
+        flags, order, stamp, best = self.flags, self.order, self.stamp, self.depth
+        neighbor_ids = grid.neighbor_ids
+        recorder = self.recorder
+
+        stamp[start] = limit
+        best[start] = 0
+        if not flags[start]:
+            flags[start] = VISITED
+            order.append(start)
+        if start == target:
+            self.path = [start]
+            return start, False
+
+        cutoff = False
+        stack = [(start, 0, iter(neighbor_ids(start)))]
+        recorder.push(start)
+        while stack:
+            node, depth, neighbors = stack[-1]
+            next_depth = depth + 1
+            for neighbor in neighbors:
+                if stamp[neighbor] == limit and best[neighbor] <= next_depth:
+                    continue
+                stamp[neighbor] = limit
+                best[neighbor] = next_depth
+                if not flags[neighbor]:
+                    flags[neighbor] = VISITED
+                    order.append(neighbor)
+
+                if neighbor == target:
+                    self.path = [frame[0] for frame in stack] + [neighbor]
+                    return neighbor, cutoff
+
+                if next_depth < limit:
+                    stack.append((neighbor, next_depth, iter(neighbor_ids(neighbor))))
+                    recorder.push(neighbor)
+                    break
+                cutoff = True
+            else:
+                stack.pop()
+                recorder.pop(node)
+
+        return -1, cutoff
+
+    def reconstruct_path(self, node):
+        # The explicit stack already holds the path, so no parent table is needed
+        position = self.grid.position
+        return [position(cell) for cell in self.path]
+
+    def path_length(self, node):
+        return len(self.path)
+
+
+class CompactBidirectionalSearch(_CompactSearch):
+    def __init__(self, grid, recorder=None):
+        super().__init__(grid, recorder)
+        size = grid.width * grid.height
+        # flags / parent serve the forward side; order records expansions of both sides
+        self.flags_backward = bytearray(size)
+        self.parent_backward = array('i', [-1]) * size
+
+    def search(self):
+        grid = self.grid
+        if not grid.is_reachable(grid.start, grid.target):
+            return self.make_result(False, -1)
+
+        start = grid.index(grid.start)
+        target = grid.index(grid.target)
+        flags_f, parent_f = self.flags, self.parent
+        flags_b, parent_b = self.flags_backward, self.parent_backward
+        recorder = self.recorder
+
+        flags_f[start] = IN_FRONTIER
+        flags_b[target] = IN_FRONTIER
+        recorder.push(start)
+        recorder.push(target)
+
+        if start == target:
+            recorder.pop(start)
+            flags_f[start] = VISITED
+            self.order.append(start)
+            return self.make_result(True, start)
+
+        layer_f = [start]
+        layer_b = [target]
+
+        # Same scheme as BidirectionalSearch: smaller layer first, meeting checked on generation
+        while layer_f and layer_b:
+            if len(layer_f) <= len(layer_b):
+                layer_f, meeting = self.expand_layer(layer_f, flags_f, parent_f, flags_b)
+            else:
+                layer_b, meeting = self.expand_layer(layer_b, flags_b, parent_b, flags_f)
+
+            if meeting != -1:
+                return self.make_result(True, meeting)
+
+        return self.make_result(False, -1)
+
+    def expand_layer(self, layer, flags, parent, other_flags):
+        neighbor_ids = self.grid.neighbor_ids
+        order = self.order
+        recorder = self.recorder
+        next_layer = []
+
+        for node in layer:
+            recorder.pop(node)
+            flags[node] = VISITED
+            order.append(node)
+
+            for neighbor in neighbor_ids(node):
+                if flags[neighbor]:
+                    continue
+                flags[neighbor] = IN_FRONTIER
+                parent[neighbor] = node
+                if other_flags[neighbor]:
+                    return next_layer, neighbor
+                next_layer.append(neighbor)
+                recorder.push(neighbor)
+
+        return next_layer, -1
+
+    def reconstruct_path(self, meeting_point):
+        path_f = []
+        current = meeting_point
+        while current != -1:
+            path_f.append(current)
+            current = self.parent[current]
+        path_f.reverse()
+
+        path_b = []
+        current = self.parent_backward[meeting_point]
+        while current != -1:
+            path_b.append(current)
+            current = self.parent_backward[current]
+
+        position = self.grid.position
+        return [position(node) for node in path_f + path_b]
+
+    def path_length(self, meeting_point):
+        # Forward chain including the meeting point, then the backward chain beyond it
+        length = super().path_length(meeting_point)
+        current = self.parent_backward[meeting_point]
+        while current != -1:
+            length += 1
+            current = self.parent_backward[current]
+        return length
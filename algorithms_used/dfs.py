@@ -1,31 +1,50 @@
 from . import SearchResult
+from .history import DeltaRecorder
+from .stepping import EXPAND, PUSH, FOUND, SearchStepper, drain
 
 class DFS:
-    def __init__(self, grid):
+    def __init__(self, grid, recorder=None):
         self.grid = grid
         self.explored = set()
         self.parent = {}
-        self.frontier_history = []
+        self.recorder = recorder if recorder is not None else DeltaRecorder()
     
     def search(self):
+        return drain(self._run(False))
+    
+    def stepper(self):
+        return SearchStepper(self)
+    
+    def _run(self, emit):
+        # Generator behind search() and stepper(); yields events only when emit is set
+        if not self.grid.is_reachable(self.grid.start, self.grid.target):
+            # Start and target lie in different components: no search needed
+            return SearchResult(False, [], self.explored, self.recorder)
+        
         frontier = [self.grid.start]
         in_frontier = {self.grid.start}
         self.parent[self.grid.start] = None
+        self.recorder.push(self.grid.start)
+        if emit:
+            yield PUSH, self.grid.start
         
         while frontier:
-            self.frontier_history.append(set(frontier))
-            
             node = frontier.pop()
+            self.recorder.pop(node)
             in_frontier.discard(node)
             
             if node in self.explored:
                 continue
             
             self.explored.add(node)
+            if emit:
+                yield EXPAND, node
             
             if node == self.grid.target:
                 path = self.reconstruct_path(node)
-                return SearchResult(True, path, self.explored, self.frontier_history)
+                if emit:
+                    yield FOUND, path
+                return SearchResult(True, path, self.explored, self.recorder)
             
             neighbors = self.grid.get_neighbors(node)
             for neighbor in reversed(neighbors):
@@ -33,8 +52,11 @@ class DFS:
                     self.parent[neighbor] = node
                     frontier.append(neighbor)
                     in_frontier.add(neighbor)
+                    self.recorder.push(neighbor)
+                    if emit:
+                        yield PUSH, neighbor
         
-        return SearchResult(False, [], self.explored, self.frontier_history)
+        return SearchResult(False, [], self.explored, self.recorder)
     
     def reconstruct_path(self, node):
         path = []
@@ -0,0 +1,188 @@
+import heapq
+from collections import namedtuple
+from . import SearchResult
+
+INF = float('inf')
+
+# One repair after an obstacle appeared; saved is None when no full rerun was measured
+ReplanStats = namedtuple(
+    'ReplanStats', ['obstacle', 'on_path', 'expansions', 'full_rerun_expansions', 'saved'])
+
+
+class DStarLite:
+    def __init__(self, grid, compare_full_replan=True, max_steps=None):
+        self.grid = grid
+        self.compare_full_replan = compare_full_replan
+        self.max_steps = max_steps if max_steps is not None else grid.width * grid.height * 2
+        self.explored = set()
+        self.expansions = 0
+        self.replans = []
+        self.dynamic_obstacles_encountered = []
+
+        # Search state kept between obstacle changes; the search runs backward from the goal
+        self.s_start = grid.start
+        self.s_goal = grid.target
+        self.g = {}
+        self.rhs = {}
+        self.queue = []
+        self.queued = {}
+        self.km = 0
+
+    def heuristic(self, a, b):
+        # Chebyshev distance: exact move count on an open 8-connected unit-cost grid
+        return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+    def calculate_key(self, node):
+        best = min(self.g.get(node, INF), self.rhs.get(node, INF))
+        return (best + self.heuristic(self.s_start, node) + self.km, best)
+
+    def push(self, node, key):
+        self.queued[node] = key
+        heapq.heappush(self.queue, (key, node))
+
+    def top_key(self):
+        # Entries whose key no longer matches `queued` were superseded or removed (lazy deletion)
+        while self.queue:
+            key, node = self.queue[0]
+            if self.queued.get(node) == key:
+                return key
+            heapq.heappop(self.queue)
+        return (INF, INF)
+
+    def update_vertex(self, node):
+        if self.grid.is_blocked(node):
+            # Cannot be entered: no finite value, and nothing to propagate from it
+            self.rhs[node] = self.g[node] = INF
+            self.queued.pop(node, None)
+            return
+        if node != self.s_goal:
+            self.rhs[node] = min((1 + self.g.get(s, INF) for s in self.grid.get_neighbors(node)),
+                                 default=INF)
+        self.queued.pop(node, None)
+        if self.g.get(node, INF) != self.rhs.get(node, INF):
+            self.push(node, self.calculate_key(node))
+
+    def initialize(self):
+        self.g.clear()
+        self.rhs.clear()
+        self.queue.clear()
+        self.queued.clear()
+        self.km = 0
+        self.rhs[self.s_goal] = 0
+        self.push(self.s_goal, self.calculate_key(self.s_goal))
+
+    def compute_shortest_path(self):
+        expansions = 0
+        while True:
+            top = self.top_key()
+            if top == (INF, INF):
+                break
+            if not (top < self.calculate_key(self.s_start)
+                    or self.rhs.get(self.s_start, INF) != self.g.get(self.s_start, INF)):
+                break
+
+            key, node = heapq.heappop(self.queue)
+            del self.queued[node]
+            expansions += 1
+            self.explored.add(node)
+
+            new_key = self.calculate_key(node)
+            g_node = self.g.get(node, INF)
+            rhs_node = self.rhs.get(node, INF)
+            if key < new_key:
+                self.push(node, new_key)
+            elif g_node > rhs_node:
+                self.g[node] = rhs_node
+                for neighbor in self.grid.get_neighbors(node):
+                    self.update_vertex(neighbor)
+            else:
+                self.g[node] = INF
+                for neighbor in self.grid.get_neighbors(node) + [node]:
+                    self.update_vertex(neighbor)
+
+        self.expansions += expansions
+        return expansions
+
+    def next_step(self, node):
+        best, best_cost = None, INF
+        for neighbor in self.grid.get_neighbors(node):
+            cost = 1 + self.g.get(neighbor, INF)
+            if cost < best_cost:
+                best, best_cost = neighbor, cost
+        return best
+
+    def planned_path(self):
+        path = [self.s_start]
+        seen = {self.s_start}
+        node = self.s_start
+        while node != self.s_goal:
+            node = self.next_step(node)
+            if node is None or node in seen:
+                return []
+            path.append(node)
+            seen.add(node)
+        return path
+
+    def full_rerun_expansions(self):
+        fresh = DStarLite(self.grid, compare_full_replan=False)
+        fresh.s_start = self.s_start
+        fresh.initialize()
+        return fresh.compute_shortest_path()
+
+    def replan(self, changed_cells, s_last):
+        # Only the changed cells and their neighbours are re-evaluated; everything else is reused
+        self.km += self.heuristic(s_last, self.s_start)
+        for cell in changed_cells:
+            self.update_vertex(cell)
+            for neighbor in self.grid.get_neighbors(cell):
+                self.update_vertex(neighbor)
+        return self.compute_shortest_path()
+
+    def search(self):
+        grid = self.grid
+        if not grid.is_reachable(self.s_start, self.s_goal):
+            return self.make_result(False, [])
+
+        self.initialize()
+        self.compute_shortest_path()
+        if self.g.get(self.s_start, INF) == INF:
+            return self.make_result(False, [])
+
+        walked = [self.s_start]
+        planned = set(self.planned_path())
+        s_last = self.s_start
+        steps = 0
+
+        while self.s_start != self.s_goal and steps < self.max_steps:
+            # Never on the agent's own cell; start and target are already excluded
+            obstacle = grid.spawn_dynamic_obstacle(avoid=self.s_start)
+            if obstacle is not None:
+                on_path = obstacle in planned
+                if on_path:
+                    self.dynamic_obstacles_encountered.append(obstacle)
+
+                expansions = self.replan([obstacle], s_last)
+                s_last = self.s_start
+
+                full = self.full_rerun_expansions() if self.compare_full_replan else None
+                saved = full - expansions if full is not None else None
+                self.replans.append(ReplanStats(obstacle, on_path, expansions, full, saved))
+                planned = set(self.planned_path())
+
+                if self.g.get(self.s_start, INF) == INF:
+                    return self.make_result(False, walked)
+
+            self.s_start = self.next_step(self.s_start)
+            if self.s_start is None:
+                return self.make_result(False, walked)
+            walked.append(self.s_start)
+            steps += 1
+
+        return self.make_result(self.s_start == self.s_goal, walked)
+
+    def make_result(self, found, path):
+        # The priority queue is reordered in place on every replan, so no frontier history is kept
+        result = SearchResult(found, path if found else [], self.explored, [])
+        result.dynamic_obstacles_encountered = self.dynamic_obstacles_encountered
+        result.replans = self.replans
+        return result
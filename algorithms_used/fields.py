@@ -0,0 +1,71 @@
+from array import array
+from collections import deque
+from .buckets import BucketQueue
+
+UNREACHED = -1
+
+
+def distance_field(grid, sources, limit=None):
+    # Distance from the nearest source to every cell, from a single traversal, as a flat
+    # array('i') indexed like grid.occupancy (UNREACHED for blocked or unreachable cells).
+    # Hop counts on unit-cost grids, cheapest path costs on weighted ones. Cells farther
+    # than limit are left UNREACHED and the traversal stops there.
+    size = grid.width * grid.height
+    dist = array('i', [UNREACHED]) * size
+    seeds = []
+    for pos in sources:
+        if not grid.is_blocked(pos):
+            index = grid.index(pos)
+            if dist[index] == UNREACHED:
+                dist[index] = 0
+                seeds.append(index)
+
+    if grid.is_uniform_cost():
+        _hop_field(grid, seeds, dist, limit)
+    else:
+        _cost_field(grid, seeds, dist, limit)
+    return dist
+
+
+def _hop_field(grid, seeds, dist, limit):
+    neighbor_ids = grid.neighbor_ids
+    frontier = deque(seeds)
+    while frontier:
+        node = frontier.popleft()
+        depth = dist[node] + 1
+        if limit is not None and depth > limit:
+            break
+        for neighbor in neighbor_ids(node):
+            if dist[neighbor] == UNREACHED:
+                dist[neighbor] = depth
+                frontier.append(neighbor)
+
+
+def _cost_field(grid, seeds, dist, limit):
+    # Dial's algorithm with the same step costs as UCS; dist doubles as the best-known cost
+    width, cell_costs = grid.width, grid.cost
+    straight, diagonal = grid.straight_cost, grid.diagonal_cost
+    neighbor_ids = grid.neighbor_ids
+    settled = bytearray(len(dist))
+    frontier = BucketQueue(grid.max_step_cost())
+    for seed in seeds:
+        frontier.push(0, seed)
+
+    while frontier:
+        cost, node = frontier.pop()
+        if settled[node]:
+            continue
+        settled[node] = 1
+        y, x = divmod(node, width)
+        for neighbor in neighbor_ids(node):
+            if settled[neighbor]:
+                continue
+            ny, nx = divmod(neighbor, width)
+            step = diagonal if nx != x and ny != y else straight
+            new_cost = cost + cell_costs[neighbor] * step
+            if limit is not None and new_cost > limit:
+                continue
+            known = dist[neighbor]
+            if known == UNREACHED or new_cost < known:
+                dist[neighbor] = new_cost
+                frontier.push(new_cost, neighbor)
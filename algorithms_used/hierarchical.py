@@ -0,0 +1,505 @@
+import hashlib
+import heapq
+from collections import OrderedDict
+from . import SearchResult
+from .bfs import BFS
+from .history import NullRecorder
+from .landmarks import layout_key
+
+# Entrances at least this many crossing moves wide get a transition at each end
+LONG_ENTRANCE = 6
+
+# Graphs already built in this process, keyed by (layout key, cluster size), least
+# recently used first. Each one holds its grid, so only a few are kept.
+GRAPH_CACHE_SIZE = 4
+_graphs = OrderedDict()
+
+
+def _signature(walls):
+    # Digest of a cluster's wall mask, so sync() can spot edited clusters without a
+    # full-grid snapshot
+    return hashlib.blake2b(walls, digest_size=16).digest()
+
+
+def _runs(walls):
+    # Run id per border cell: consecutive free cells share an id (straight moves along the
+    # border connect them inside their cluster), walls get -1
+    runs = []
+    run = -1
+    previous_free = False
+    for wall in walls:
+        if wall:
+            runs.append(-1)
+            previous_free = False
+        else:
+            if not previous_free:
+                run += 1
+            runs.append(run)
+            previous_free = True
+    return runs
+
+
+# Abstract graph for HPA*-style search. The grid is cut into cluster_size squares; moves
+# across each cluster border are grouped into entrances and a few of them become
+# transitions. Each cluster stores the hop distances between its own entrance cells,
+# measured without leaving the cluster. Moves may cross a border diagonally, including
+# through the corner point where four clusters meet. The abstraction is built from
+# static walls, read cluster by cluster through grid.wall_mask; dynamic obstacles only
+# matter during refinement.
+class ClusterGraph:
+    def __init__(self, grid, cluster_size=32):
+        if cluster_size < 2:
+            raise ValueError(f"Cluster size must be at least 2, got {cluster_size}")
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.columns = -(-grid.width // cluster_size)
+        self.rows = -(-grid.height // cluster_size)
+        # Transition moves (cell, cell) per border, and the same moves indexed by cell
+        self.transitions = {}
+        self.links = {}
+        # Entrance cells per cluster; intra-cluster edges entrance -> [(entrance, hops)]
+        self.entrances = {}
+        self.edges = {}
+        self.signatures = {}
+        self.rebuilt = 0
+
+        for border in self.all_borders():
+            self.set_transitions(border, self.find_transitions(border))
+        for cy in range(self.rows):
+            for cx in range(self.columns):
+                self.build_cluster((cx, cy))
+
+    @classmethod
+    def for_grid(cls, grid, cluster_size=32):
+        key = (layout_key(grid), cluster_size)
+        graph = _graphs.get(key)
+        if graph is not None:
+            _graphs.move_to_end(key)
+        else:
+            # Walls of a grid we already abstracted were edited: rebuild only what changed
+            for old_key, old_graph in list(_graphs.items()):
+                if old_graph.grid is grid and old_key[1] == cluster_size:
+                    del _graphs[old_key]
+                    old_graph.sync()
+                    graph = old_graph
+                    break
+            else:
+                graph = cls(grid, cluster_size)
+            _graphs[key] = graph
+            while len(_graphs) > GRAPH_CACHE_SIZE:
+                _graphs.popitem(last=False)
+        graph.grid = grid
+        return graph
+
+    def all_borders(self):
+        # 'v': between (cx, cy) and (cx + 1, cy); 'h': between (cx, cy) and (cx, cy + 1);
+        # 'c': the corner point shared by (cx, cy), (cx + 1, cy), (cx, cy + 1), (cx + 1, cy + 1)
+        for cy in range(self.rows):
+            for cx in range(self.columns):
+                if cx + 1 < self.columns:
+                    yield ('v', cx, cy)
+                if cy + 1 < self.rows:
+                    yield ('h', cx, cy)
+                if cx + 1 < self.columns and cy + 1 < self.rows:
+                    yield ('c', cx, cy)
+
+    def valid_border(self, border):
+        kind, cx, cy = border
+        if cx < 0 or cy < 0:
+            return False
+        if kind == 'v':
+            return cx + 1 < self.columns and cy < self.rows
+        if kind == 'h':
+            return cx < self.columns and cy + 1 < self.rows
+        return cx + 1 < self.columns and cy + 1 < self.rows
+
+    def incident_borders(self, cluster):
+        cx, cy = cluster
+        candidates = (('v', cx, cy), ('v', cx - 1, cy), ('h', cx, cy), ('h', cx, cy - 1),
+                      ('c', cx, cy), ('c', cx - 1, cy), ('c', cx, cy - 1), ('c', cx - 1, cy - 1))
+        return [border for border in candidates if self.valid_border(border)]
+
+    def border_clusters(self, border):
+        kind, cx, cy = border
+        if kind == 'v':
+            return [(cx, cy), (cx + 1, cy)]
+        if kind == 'h':
+            return [(cx, cy), (cx, cy + 1)]
+        return [(cx, cy), (cx + 1, cy), (cx, cy + 1), (cx + 1, cy + 1)]
+
+    def bounds(self, cluster):
+        # (x0, y0, x1, y1) with exclusive upper corner; edge clusters may be smaller
+        cx, cy = cluster
+        size = self.cluster_size
+        return (cx * size, cy * size,
+                min(self.grid.width, (cx + 1) * size), min(self.grid.height, (cy + 1) * size))
+
+    def cluster_of(self, cell):
+        y, x = divmod(cell, self.grid.width)
+        return x // self.cluster_size, y // self.cluster_size
+
+    def find_transitions(self, border):
+        kind, cx, cy = border
+        grid = self.grid
+        width = grid.width
+        x0, y0, x1, y1 = self.bounds((cx, cy))
+        if kind == 'v':
+            side_a = [y * width + x1 - 1 for y in range(y0, y1)]
+            return self.side_transitions(side_a, [cell + 1 for cell in side_a],
+                                         grid.wall_mask(x1 - 1, y0, x1, y1),
+                                         grid.wall_mask(x1, y0, x1 + 1, y1))
+        if kind == 'h':
+            side_a = [(y1 - 1) * width + x for x in range(x0, x1)]
+            return self.side_transitions(side_a, [cell + width for cell in side_a],
+                                         grid.wall_mask(x0, y1 - 1, x1, y1),
+                                         grid.wall_mask(x0, y1, x1, y1 + 1))
+
+        # Corner point (x1, y1): the two diagonal moves through it, read from the 2x2
+        # block around it (top left, top right, bottom left, bottom right)
+        walls = grid.wall_mask(x1 - 1, y1 - 1, x1 + 1, y1 + 1)
+        top_left = (y1 - 1) * width + x1 - 1
+        pairs = []
+        if not walls[0] and not walls[3]:
+            pairs.append((top_left, top_left + width + 1))
+        if not walls[1] and not walls[2]:
+            pairs.append((top_left + 1, top_left + width))
+        return pairs
+
+    def side_transitions(self, side_a, side_b, walls_a, walls_b):
+        # Crossing moves (straight or diagonal) between two facing border lines, grouped by
+        # the free run they leave and the free run they enter. Any move of a group can be
+        # swapped for another one through those two runs, so one transition per group (two
+        # for wide groups) keeps the abstraction complete.
+        runs_a = _runs(walls_a)
+        runs_b = _runs(walls_b)
+        length = len(side_a)
+        groups = {}
+        for i in range(length):
+            if runs_a[i] < 0:
+                continue
+            for j in (i - 1, i, i + 1):
+                if 0 <= j < length and runs_b[j] >= 0:
+                    groups.setdefault((runs_a[i], runs_b[j]), []).append((side_a[i], side_b[j]))
+
+        pairs = []
+        for moves in groups.values():
+            if len(moves) >= LONG_ENTRANCE:
+                pairs.append(moves[0])
+                pairs.append(moves[-1])
+            else:
+                pairs.append(moves[len(moves) // 2])
+        return pairs
+
+    def set_transitions(self, border, pairs):
+        links = self.links
+        for a, b in self.transitions.get(border, ()):
+            links[a].remove(b)
+            links[b].remove(a)
+            if not links[a]:
+                del links[a]
+            if not links[b]:
+                del links[b]
+        for a, b in pairs:
+            links.setdefault(a, []).append(b)
+            links.setdefault(b, []).append(a)
+        self.transitions[border] = pairs
+
+    def build_cluster(self, cluster):
+        edges = self.edges
+        for cell in self.entrances.get(cluster, ()):
+            edges.pop(cell, None)
+
+        cluster_of = self.cluster_of
+        entrances = sorted({cell for border in self.incident_borders(cluster)
+                            for pair in self.transitions[border] for cell in pair
+                            if cluster_of(cell) == cluster})
+        self.entrances[cluster] = entrances
+
+        # Hop distances are symmetric, so each BFS only looks for the entrances after it
+        bounds = self.bounds(cluster)
+        walls = self.grid.wall_mask(*bounds)
+        self.signatures[cluster] = _signature(walls)
+        local = self.local_walls(bounds, walls)
+        for cell in entrances:
+            edges[cell] = []
+        for i, cell in enumerate(entrances):
+            distances = self.local_distances(local, cell, entrances[i + 1:])
+            for other, hops in distances.items():
+                edges[cell].append((other, hops))
+                edges[other].append((cell, hops))
+        self.rebuilt += 1
+
+    def local_walls(self, bounds, walls=None):
+        # The cluster's walls with a one-cell wall frame around them, so a BFS inside it
+        # needs no bounds checks: (bounds, padded walls, padded row width, move offsets)
+        x0, y0, x1, y1 = bounds
+        if walls is None:
+            walls = self.grid.wall_mask(*bounds)
+        inner = x1 - x0
+        row_width = inner + 2
+        padded = bytearray(b'\x01') * row_width
+        for row in range(0, len(walls), inner):
+            padded += b'\x01'
+            padded += walls[row:row + inner]
+            padded += b'\x01'
+        padded += b'\x01' * row_width
+        offsets = tuple(dy * row_width + dx for dx, dy, _ in self.grid.neighbor_offsets)
+        return bounds, padded, row_width, offsets
+
+    def local_distances(self, local, source, goals):
+        # Hop distances from source to the goal cells it reaches without leaving the
+        # cluster; stops as soon as every goal is settled
+        (x0, y0, _, _), padded, row_width, offsets = local
+        width = self.grid.width
+
+        def to_local(cell):
+            y, x = divmod(cell, width)
+            return (y - y0 + 1) * row_width + (x - x0 + 1)
+
+        wanted = {to_local(cell): cell for cell in goals}
+        start = to_local(source)
+        found = {source: 0} if start in wanted else {}
+        remaining = len(wanted) - len(found)
+        blocked = bytearray(padded)
+        blocked[start] = 1
+        frontier = [start]
+        depth = 0
+        while frontier and remaining:
+            depth += 1
+            layer = []
+            for node in frontier:
+                for offset in offsets:
+                    neighbor = node + offset
+                    if not blocked[neighbor]:
+                        blocked[neighbor] = 1
+                        layer.append(neighbor)
+                        cell = wanted.get(neighbor)
+                        if cell is not None:
+                            found[cell] = depth
+                            remaining -= 1
+            frontier = layer
+        return found
+
+    def cluster_distances(self, bounds, source, goals):
+        return self.local_distances(self.local_walls(bounds), source, goals)
+
+    def update(self, cells):
+        # cells: positions whose walls were added or removed since the graph was built
+        grid = self.grid
+        clusters = {self.cluster_of(grid.index(pos)) for pos in cells}
+        return self.rebuild(clusters) if clusters else set()
+
+    def sync(self):
+        # Re-reads each cluster's walls and rebuilds only those whose digest changed
+        grid = self.grid
+        clusters = set()
+        for cy in range(self.rows):
+            for cx in range(self.columns):
+                cluster = (cx, cy)
+                if _signature(grid.wall_mask(*self.bounds(cluster))) != self.signatures[cluster]:
+                    clusters.add(cluster)
+        return self.rebuild(clusters) if clusters else set()
+
+    def rebuild(self, clusters):
+        # Borders of the changed clusters are re-scanned; a neighbor is rebuilt only when
+        # the transitions it shares with them actually changed
+        touched = set(clusters)
+        borders = {border for cluster in clusters for border in self.incident_borders(cluster)}
+        for border in borders:
+            pairs = self.find_transitions(border)
+            if pairs != self.transitions[border]:
+                self.set_transitions(border, pairs)
+                touched.update(self.border_clusters(border))
+        for cluster in touched:
+            self.build_cluster(cluster)
+        return touched
+
+
+# A cluster's cells presented as a small standalone grid, so any search class can refine
+# one leg of an abstract route without touching the rest of the map
+class ClusterView:
+    def __init__(self, grid, bounds, start, target):
+        x0, y0, x1, y1 = bounds
+        self.origin = (x0, y0)
+        self.width = width = x1 - x0
+        self.height = height = y1 - y0
+        self.start = (start[0] - x0, start[1] - y0)
+        self.target = (target[0] - x0, target[1] - y0)
+        is_blocked = grid.is_blocked
+        # Copied per cell so mapped grids never unpack their whole occupancy plane
+        self.occupancy = bytearray(1 if is_blocked((x, y)) else 0
+                                   for y in range(y0, y1) for x in range(x0, x1))
+        self.cost = bytearray(b'\x01') * (width * height)
+        self.straight_cost = 1
+        self.diagonal_cost = 1
+        self.dynamic_obstacles = set()
+        self.neighbor_offsets = tuple((dx, dy, dy * width + dx) for dx, dy, _ in grid.neighbor_offsets)
+
+    def index(self, pos):
+        return pos[1] * self.width + pos[0]
+
+    def position(self, index):
+        y, x = divmod(index, self.width)
+        return (x, y)
+
+    def is_blocked(self, pos):
+        x, y = pos
+        return not (0 <= x < self.width and 0 <= y < self.height) or bool(self.occupancy[y * self.width + x])
+
+    def is_reachable(self, a, b):
+        # No component labels here: a failed search inside a single cluster is cheap
+        return not self.is_blocked(a) and not self.is_blocked(b)
+
+    def any_reachable(self, sources, targets):
+        # Multi-endpoint form used by the searches' _run; same per-cluster check
+        return any(not self.is_blocked(pos) for pos in sources) and \
+            any(not self.is_blocked(pos) for pos in targets)
+
+    def is_uniform_cost(self):
+        return True
+
+    def max_step_cost(self):
+        return 1
+
+    def get_neighbors(self, pos):
+        x, y = pos
+        width, height = self.width, self.height
+        occupancy = self.occupancy
+        base = y * width + x
+        return [(x + dx, y + dy) for dx, dy, offset in self.neighbor_offsets
+                if 0 <= x + dx < width and 0 <= y + dy < height and not occupancy[base + offset]]
+
+    def neighbor_ids(self, index):
+        width, height = self.width, self.height
+        y, x = divmod(index, width)
+        occupancy = self.occupancy
+        return [index + offset for dx, dy, offset in self.neighbor_offsets
+                if 0 <= x + dx < width and 0 <= y + dy < height and not occupancy[index + offset]]
+
+
+# HPA*: an A* over the cluster graph picks the corridor, then each leg inside a cluster
+# is refined with an existing search class (BFS by default). Hop counts only; the path
+# is near-shortest, since the abstraction keeps just a few crossing points per entrance.
+class HierarchicalSearch:
+    def __init__(self, grid, graph=None, cluster_size=32, refine=BFS, recorder=None):
+        self.grid = grid
+        self.graph = graph if graph is not None else ClusterGraph.for_grid(grid, cluster_size)
+        self.refine = refine
+        self.explored = set()
+        self.recorder = recorder if recorder is not None else NullRecorder()
+        self.abstract_expanded = 0
+        # Set when a dynamic obstacle blocked a refined leg and the flat search took over
+        self.fallback = False
+
+    def search(self):
+        grid = self.grid
+        if not grid.is_reachable(grid.start, grid.target):
+            return SearchResult(False, [], self.explored, self.recorder)
+
+        route = self.abstract_route(grid.index(grid.start), grid.index(grid.target))
+        path = self.refine_route(route) if route is not None else None
+        if path is None:
+            return self.search_flat()
+        return SearchResult(True, path, self.explored, self.recorder)
+
+    def abstract_route(self, start, target):
+        grid, graph = self.grid, self.graph
+        recorder = self.recorder
+        position = grid.position
+        width = grid.width
+        ty, tx = divmod(target, width)
+
+        # Start and target join the abstract graph through in-cluster distances
+        start_cluster = graph.cluster_of(start)
+        goals = list(graph.entrances[start_cluster])
+        if graph.cluster_of(target) == start_cluster:
+            goals.append(target)
+        start_edges = graph.cluster_distances(graph.bounds(start_cluster), start, goals)
+        target_cluster = graph.cluster_of(target)
+        target_edges = graph.cluster_distances(graph.bounds(target_cluster), target,
+                                               graph.entrances[target_cluster])
+
+        def heuristic(cell):
+            y, x = divmod(cell, width)
+            return max(abs(x - tx), abs(y - ty))
+
+        def neighbors(node):
+            edges = list(graph.edges.get(node, ()))
+            if node == start:
+                edges.extend(start_edges.items())
+            edges.extend((other, 1) for other in graph.links.get(node, ()))
+            hops = target_edges.get(node)
+            if hops is not None:
+                edges.append((target, hops))
+            return edges
+
+        best = {start: 0}
+        parent = {start: None}
+        closed = set()
+        frontier = [(heuristic(start), 0, start)]
+        counter = 1
+        recorder.push(position(start))
+
+        while frontier:
+            _, _, node = heapq.heappop(frontier)
+            recorder.pop(position(node))
+            if node in closed:
+                continue
+            closed.add(node)
+            self.abstract_expanded += 1
+
+            if node == target:
+                route = []
+                while node is not None:
+                    route.append(node)
+                    node = parent[node]
+                route.reverse()
+                return route
+
+            cost = best[node]
+            for neighbor, hops in neighbors(node):
+                if neighbor == node or neighbor in closed:
+                    continue
+                new_cost = cost + hops
+                if new_cost < best.get(neighbor, new_cost + 1):
+                    best[neighbor] = new_cost
+                    parent[neighbor] = node
+                    heapq.heappush(frontier, (new_cost + heuristic(neighbor), counter, neighbor))
+                    counter += 1
+                    recorder.push(position(neighbor))
+
+        return None
+
+    def refine_route(self, route):
+        grid, graph = self.grid, self.graph
+        position = grid.position
+        path = [position(route[0])]
+        for a, b in zip(route, route[1:]):
+            cluster = graph.cluster_of(a)
+            if graph.cluster_of(b) != cluster:
+                # A transition: one move into the neighboring cluster
+                if grid.is_blocked(position(b)):
+                    return None
+                path.append(position(b))
+                continue
+            leg = self.refine_leg(graph.bounds(cluster), position(a), position(b))
+            if leg is None:
+                return None
+            path.extend(leg[1:])
+        return path
+
+    def refine_leg(self, bounds, a, b):
+        view = ClusterView(self.grid, bounds, a, b)
+        result = self.refine(view, recorder=NullRecorder()).search()
+        x0, y0 = view.origin
+        self.explored.update((x + x0, y + y0) for x, y in result.explored)
+        if not result.found:
+            return None
+        return [(x + x0, y + y0) for x, y in result.path]
+
+    def search_flat(self):
+        # Dynamic obstacles can block a leg the static abstraction allowed
+        self.fallback = True
+        result = self.refine(self.grid, recorder=NullRecorder()).search()
+        self.explored.update(result.explored)
+        return SearchResult(result.found, result.path, self.explored, self.recorder)
@@ -0,0 +1,99 @@
+PUSH = 0
+POP = 1
+
+
+# Records nothing; frontier history stays empty
+class NullRecorder:
+    decode = None
+
+    def push(self, node):
+        pass
+
+    def pop(self, node):
+        pass
+
+    def snapshots(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+
+# Keeps a full frontier snapshot every `every` pops
+class SampledRecorder:
+    decode = None
+
+    def __init__(self, every=100):
+        if every < 1:
+            raise ValueError(f"Sampling interval must be at least 1, got {every}")
+        self.every = every
+        self.live = {}
+        self.pops = 0
+        self.samples = []
+
+    def push(self, node):
+        self.live[node] = self.live.get(node, 0) + 1
+
+    def pop(self, node):
+        if self.pops % self.every == 0:
+            self.samples.append(set(self.live))
+        self.pops += 1
+        count = self.live.get(node, 0)
+        if count > 1:
+            self.live[node] = count - 1
+        else:
+            self.live.pop(node, None)
+
+    def snapshots(self):
+        decode = self.decode
+        for sample in self.samples:
+            yield {decode(node) for node in sample} if decode else sample
+
+    def __len__(self):
+        return len(self.samples)
+
+
+# Stores push/pop events and rebuilds frontier snapshots on demand
+class DeltaRecorder:
+    decode = None
+
+    def __init__(self):
+        self.kinds = bytearray()
+        self.nodes = []
+        self.pops = 0
+
+    def push(self, node):
+        self.kinds.append(PUSH)
+        self.nodes.append(node)
+
+    def pop(self, node):
+        self.kinds.append(POP)
+        self.nodes.append(node)
+        self.pops += 1
+
+    def events(self):
+        decode = self.decode
+        for kind, node in zip(self.kinds, self.nodes):
+            yield kind, decode(node) if decode else node
+
+    def replay(self):
+        # Yields (popped node, frontier just before the pop); the frontier dict is
+        # reused between steps, so copy it if it has to outlive the iteration
+        live = {}
+        for kind, node in self.events():
+            if kind == PUSH:
+                live[node] = live.get(node, 0) + 1
+                continue
+            yield node, live
+            count = live.get(node, 0)
+            if count > 1:
+                live[node] = count - 1
+            else:
+                live.pop(node, None)
+
+    def snapshots(self):
+        for _, live in self.replay():
+            yield set(live)
+
+    def __len__(self):
+        return self.pops
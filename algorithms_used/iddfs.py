@@ -1,60 +1,119 @@
 from . import SearchResult
+from .history import NullRecorder
+from .stepping import EXPAND, PUSH, FOUND, SearchStepper, drain
 
 class IDDFS:
-    def __init__(self, grid):
+    def __init__(self, grid, memory_bounded=False, recorder=None):
         self.grid = grid
         self.explored = set()
-        self.parent = {}
-        self.frontier_history = []
-    
+        self.best_depth = {}
+        self.recorder = recorder if recorder is not None else NullRecorder()
+        # memory_bounded: keep only the current path (O(depth) memory) instead of the
+        # best depth per node; revisits become exponential, so use it on small problems
+        self.memory_bounded = memory_bounded
+        self.expansions = 0
+        self.iterations = 0
+
     def search(self):
-        max_depth = max(self.grid.width, self.grid.height) * 2
-        all_explored = set()
-        
-        for limit in range(1, max_depth + 1):
-            self.explored = set()
-            self.parent = {}
-            
-            result = self.dfs_limited(limit)
-            
-            all_explored.update(self.explored)
-            
-            if result is not None:
-                return SearchResult(True, result, all_explored, self.frontier_history)
-        
-        return SearchResult(False, [], all_explored, self.frontier_history)
-    
-    def dfs_limited(self, limit):
-        self.parent[self.grid.start] = None
-        result = self.dfs_recursive(self.grid.start, 0, limit)
-        return result
-    
-    def dfs_recursive(self, node, depth, limit):
-        if node in self.explored:
-            return None
-        
-        self.explored.add(node)
-        
-        if node == self.grid.target:
-            path = self.reconstruct_path(node)
-            return path
-        
-        if depth < limit:
-            neighbors = self.grid.get_neighbors(node)
+        return drain(self._run(False))
+
+    def stepper(self):
+        return SearchStepper(self)
+
+    def _run(self, emit):
+        # Generator behind search() and stepper(); yields events only when emit is set
+        if not self.grid.is_reachable(self.grid.start, self.grid.target):
+            # Start and target lie in different components: no search needed
+            return SearchResult(False, [], set(), self.recorder)
+
+        # No path can be shorter than the Chebyshev distance, so earlier limits are skipped;
+        # a simple path never needs more moves than there are cells
+        (sx, sy), (tx, ty) = self.grid.start, self.grid.target
+        first_limit = max(1, abs(sx - tx), abs(sy - ty))
+        max_depth = self.grid.width * self.grid.height
+
+        for limit in range(first_limit, max_depth + 1):
+            self.iterations += 1
+            path, cutoff = yield from self.depth_limited(limit, emit)
+
+            if path is not None:
+                if emit:
+                    yield FOUND, path
+                return self.make_result(True, path)
+
+            # Nothing was cut off by the limit: deeper iterations would explore the same nodes
+            if not cutoff:
+                break
+
+        return self.make_result(False, [])
+
+    def depth_limited(self, limit, emit=False):
+        grid = self.grid
+        start, target = grid.start, grid.target
+        recorder = self.recorder
+
+        if start == target:
+            self.expansions += 1
+            self.explored.add(start)
+            if emit:
+                yield EXPAND, start
+            return [start], False
+
+        # best_depth: shallowest depth each node was reached at in this iteration; a node is
+        # only re-entered through a strictly shorter route, which keeps IDDFS optimal on graphs
+        best_depth = self.best_depth
+        best_depth.clear()
+        best_depth[start] = 0
+        on_path = {start}
+        memory_bounded = self.memory_bounded
+        cutoff = False
+
+        # Explicit stack of (node, depth, neighbor iterator) instead of recursion
+        stack = [(start, 0, iter(grid.get_neighbors(start)))]
+        recorder.push(start)
+        self.expansions += 1
+        if not memory_bounded:
+            self.explored.add(start)
+        if emit:
+            yield PUSH, start
+            yield EXPAND, start
+
+        while stack:
+            node, depth, neighbors = stack[-1]
+            next_depth = depth + 1
             for neighbor in neighbors:
-                if neighbor not in self.explored:
-                    self.parent[neighbor] = node
-                    result = self.dfs_recursive(neighbor, depth + 1, limit)
-                    if result is not None:
-                        return result
-        
-        return None
-    
-    def reconstruct_path(self, node):
-        path = []
-        current = node
-        while current is not None:
-            path.append(current)
-            current = self.parent[current]
-        path.reverse()
-        return path
+                if memory_bounded:
+                    if neighbor in on_path:
+                        continue
+                elif best_depth.get(neighbor, limit + 1) <= next_depth:
+                    continue
+                else:
+                    best_depth[neighbor] = next_depth
+                    self.explored.add(neighbor)
+                self.expansions += 1
+                if emit:
+                    yield PUSH, neighbor
+
+                if neighbor == target:
+                    return [frame[0] for frame in stack] + [neighbor], cutoff
+
+                if next_depth < limit:
+                    stack.append((neighbor, next_depth, iter(grid.get_neighbors(neighbor))))
+                    on_path.add(neighbor)
+                    recorder.push(neighbor)
+                    if emit:
+                        yield EXPAND, neighbor
+                    break
+                cutoff = True
+            else:
+                stack.pop()
+                on_path.discard(node)
+                recorder.pop(node)
+
+        return None, cutoff
+
+    def make_result(self, found, path):
+        result = SearchResult(found, path, self.explored, self.recorder)
+        if self.memory_bounded:
+            result.total_nodes_explored = self.expansions
+        return result
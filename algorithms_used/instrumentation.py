@@ -0,0 +1,113 @@
+import time
+
+# Plain grid attributes copied onto the proxy so hot loops don't go through __getattr__
+# (occupancy is left out: on mapped grids it is a property that unpacks the bit plane)
+_COPIED_ATTRIBUTES = ('width', 'height', 'start', 'target', 'neighbor_offsets')
+
+
+# Counters and timers for one search; filled by CountingRecorder and InstrumentedGrid
+class SearchStats:
+    def __init__(self):
+        self.pops = 0
+        self.pushes = 0
+        self.duplicate_skips = 0
+        self.peak_frontier = 0
+        self.neighbor_calls = 0
+        self.neighbor_time = 0.0
+        self.total_time = 0.0
+
+    @property
+    def bookkeeping_time(self):
+        # Everything outside neighbor generation: frontier, explored set, parents, path
+        return max(0.0, self.total_time - self.neighbor_time)
+
+    def as_dict(self):
+        return {
+            'pops': self.pops,
+            'pushes': self.pushes,
+            'duplicate_skips': self.duplicate_skips,
+            'peak_frontier': self.peak_frontier,
+            'neighbor_calls': self.neighbor_calls,
+            'neighbor_time': self.neighbor_time,
+            'bookkeeping_time': self.bookkeeping_time,
+            'total_time': self.total_time,
+        }
+
+
+# Wraps a search's recorder to count pushes/pops, repeated pops and the live frontier size
+class CountingRecorder:
+    def __init__(self, inner, stats):
+        self.inner = inner
+        self.stats = stats
+        self.popped = set()
+        self.live = 0
+
+    def push(self, node):
+        stats = self.stats
+        stats.pushes += 1
+        self.live += 1
+        if self.live > stats.peak_frontier:
+            stats.peak_frontier = self.live
+        self.inner.push(node)
+
+    def pop(self, node):
+        stats = self.stats
+        stats.pops += 1
+        self.live -= 1
+        # A node popped again is a stale duplicate entry (or an IDDFS revisit)
+        if node in self.popped:
+            stats.duplicate_skips += 1
+        else:
+            self.popped.add(node)
+        self.inner.pop(node)
+
+    def __len__(self):
+        return len(self.inner)
+
+    def __getattr__(self, name):
+        # decode, events, replay, snapshots... come from the wrapped recorder
+        return getattr(self.inner, name)
+
+
+# Grid proxy that counts and times neighbor generation; everything else is forwarded
+class InstrumentedGrid:
+    def __init__(self, grid, stats):
+        self.grid = grid
+        self.stats = stats
+        for name in _COPIED_ATTRIBUTES:
+            setattr(self, name, getattr(grid, name))
+
+    def get_neighbors(self, pos):
+        stats = self.stats
+        started = time.perf_counter()
+        neighbors = self.grid.get_neighbors(pos)
+        stats.neighbor_time += time.perf_counter() - started
+        stats.neighbor_calls += 1
+        return neighbors
+
+    def neighbor_ids(self, index):
+        stats = self.stats
+        started = time.perf_counter()
+        neighbors = self.grid.neighbor_ids(index)
+        stats.neighbor_time += time.perf_counter() - started
+        stats.neighbor_calls += 1
+        return neighbors
+
+    def __getattr__(self, name):
+        return getattr(self.grid, name)
+
+
+def run_instrumented(algorithm_class, grid, **kwargs):
+    # Searches keep no instrumentation code of their own: the grid and recorder they are
+    # given are swapped for counting wrappers, so uninstrumented runs pay nothing
+    stats = SearchStats()
+    algorithm = algorithm_class(InstrumentedGrid(grid, stats), **kwargs)
+    if hasattr(algorithm, 'recorder'):
+        algorithm.recorder = CountingRecorder(algorithm.recorder, stats)
+
+    started = time.perf_counter()
+    result = algorithm.search()
+    stats.total_time = time.perf_counter() - started
+
+    result.stats = stats
+    return result
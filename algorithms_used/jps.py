@@ -0,0 +1,160 @@
+import heapq
+from . import SearchResult
+from .history import NullRecorder
+from .ucs import UCS
+
+
+class JPS:
+    def __init__(self, grid, recorder=None):
+        self.grid = grid
+        self.explored = set()
+        self.parent = {}
+        self.cost = {}
+        self.recorder = recorder if recorder is not None else NullRecorder()
+        self.scanned = 0
+        self.counter = 0
+
+    def search(self):
+        grid = self.grid
+        if not grid.is_uniform_cost():
+            # Jumps count hops only, which is not cost-optimal with terrain or move costs
+            return UCS(grid, recorder=self.recorder).search()
+        if not grid.is_reachable(grid.start, grid.target):
+            return self.make_result(False, [])
+
+        start, target = grid.start, grid.target
+        tx, ty = target
+        explored, parent, best = self.explored, self.parent, self.cost
+        recorder = self.recorder
+        width, height = grid.width, grid.height
+        # Grids holding occupancy as a plain buffer are read directly; mapped grids only
+        # expose it as a property that unpacks the whole plane, so they go through is_blocked
+        occupancy = vars(grid).get('occupancy')
+        is_blocked = grid.is_blocked
+
+        if occupancy is not None:
+            def free(x, y):
+                return 0 <= x < width and 0 <= y < height and not occupancy[y * width + x]
+        else:
+            def free(x, y):
+                return not is_blocked((x, y))
+
+        def jump(x, y, dx, dy):
+            # Walk from (x, y) in direction (dx, dy) until the target, a cell with a forced
+            # neighbor, or (diagonally) a cell whose straight jumps find one. Every move
+            # costs 1 and corners may be cut, so only the destination cell has to be free.
+            while True:
+                x += dx
+                y += dy
+                self.scanned += 1
+                if not free(x, y):
+                    return None
+                if x == tx and y == ty:
+                    return x, y
+                if dx and dy:
+                    if (free(x - dx, y + dy) and not free(x - dx, y)) or \
+                            (free(x + dx, y - dy) and not free(x, y - dy)):
+                        return x, y
+                    if jump(x, y, dx, 0) is not None or jump(x, y, 0, dy) is not None:
+                        return x, y
+                elif dx:
+                    if (free(x + dx, y + 1) and not free(x, y + 1)) or \
+                            (free(x + dx, y - 1) and not free(x, y - 1)):
+                        return x, y
+                else:
+                    if (free(x + 1, y + dy) and not free(x + 1, y)) or \
+                            (free(x - 1, y + dy) and not free(x - 1, y)):
+                        return x, y
+
+        def directions(node):
+            x, y = node
+            previous = parent[node]
+            if previous is None:
+                return [(dx, dy) for dx, dy, _ in grid.neighbor_offsets]
+            dx = (x > previous[0]) - (x < previous[0])
+            dy = (y > previous[1]) - (y < previous[1])
+
+            # Natural neighbors continue the move; forced ones appear next to blocked cells
+            if dx and dy:
+                moves = [(dx, 0), (0, dy), (dx, dy)]
+                if not free(x - dx, y):
+                    moves.append((-dx, dy))
+                if not free(x, y - dy):
+                    moves.append((dx, -dy))
+            elif dx:
+                moves = [(dx, 0)]
+                if not free(x, y + 1):
+                    moves.append((dx, 1))
+                if not free(x, y - 1):
+                    moves.append((dx, -1))
+            else:
+                moves = [(0, dy)]
+                if not free(x + 1, y):
+                    moves.append((1, dy))
+                if not free(x - 1, y):
+                    moves.append((-1, dy))
+            return moves
+
+        def heuristic(node):
+            # Chebyshev distance: exact hop count on an open 8-connected grid
+            return max(abs(node[0] - tx), abs(node[1] - ty))
+
+        best[start] = 0
+        parent[start] = None
+        frontier = [(heuristic(start), self.counter, start)]
+        self.counter += 1
+        recorder.push(start)
+
+        while frontier:
+            _, _, node = heapq.heappop(frontier)
+            recorder.pop(node)
+
+            # Entries superseded by a shorter route stay queued and are skipped here
+            if node in explored:
+                continue
+
+            explored.add(node)
+
+            if node == target:
+                return self.make_result(True, self.reconstruct_path(node))
+
+            cost = best[node]
+            for dx, dy in directions(node):
+                point = jump(node[0], node[1], dx, dy)
+                if point is None or point in explored:
+                    continue
+                # Jump points lie on a straight or diagonal line: hops = Chebyshev distance
+                new_cost = cost + max(abs(point[0] - node[0]), abs(point[1] - node[1]))
+                if new_cost < best.get(point, new_cost + 1):
+                    best[point] = new_cost
+                    parent[point] = node
+                    heapq.heappush(frontier, (new_cost + heuristic(point), self.counter, point))
+                    self.counter += 1
+                    recorder.push(point)
+
+        return self.make_result(False, [])
+
+    def reconstruct_path(self, node):
+        # Fill in the cells between consecutive jump points
+        points = []
+        current = node
+        while current is not None:
+            points.append(current)
+            current = self.parent[current]
+        points.reverse()
+
+        path = [points[0]]
+        for (x, y), (nx, ny) in zip(points, points[1:]):
+            dx = (nx > x) - (nx < x)
+            dy = (ny > y) - (ny < y)
+            while (x, y) != (nx, ny):
+                x += dx
+                y += dy
+                path.append((x, y))
+        return path
+
+    def make_result(self, found, path):
+        # explored holds the expanded jump points; scanned counts every cell a jump stepped on
+        result = SearchResult(found, path, self.explored, self.recorder)
+        result.cells_scanned = self.scanned
+        return result
@@ -0,0 +1,314 @@
+import hashlib
+import os
+import struct
+from array import array
+from collections import OrderedDict
+from .buckets import BucketQueue
+from .compact import _CompactSearch, VISITED, IN_FRONTIER
+
+WALL_FLAG = 1
+
+# Only static walls feed the tables and their cache key; dynamic obstacles are masked out
+_WALL_MASK = bytes(flags & WALL_FLAG for flags in range(256))
+
+_MAGIC = b'LMK1'
+
+# Tables already built or loaded in this process, keyed by (layout key, landmark count),
+# least recently used first. Each one holds its grid and count * width * height distances,
+# so only a few are kept (long-running workers see many layouts).
+TABLE_CACHE_SIZE = 4
+_tables = OrderedDict()
+
+
+def default_cache_dir():
+    # Tables are only written to disk when asked for: PATHFINDER_CACHE or for_grid(cache_dir=...)
+    return os.environ.get('PATHFINDER_CACHE')
+
+
+def layout_key(grid):
+    # Hashed in bands of rows (same digest as the whole mask at once), so a mapped grid
+    # never unpacks its full plane just to be looked up
+    width, height = grid.width, grid.height
+    digest = hashlib.sha256(struct.pack('<II', width, height))
+    band = max(1, (1 << 20) // max(1, width))
+    for y in range(0, height, band):
+        digest.update(grid.wall_mask(0, y, width, min(height, y + band)))
+    return digest.hexdigest()[:32]
+
+
+# Hop-count distance fields from a few landmark cells of a static grid. Distances are
+# stored as uint16 when every distance fits, uint32 otherwise; UNREACHED marks cells
+# in another component. By the triangle inequality they bound any pair's distance:
+#   max_L |d(L, a) - d(L, b)|  <=  d(a, b)  <=  min_L d(a, L) + d(L, b)
+class LandmarkTable:
+    def __init__(self, grid, count=8, landmarks=None):
+        self.grid = grid
+        self.key = layout_key(grid)
+        size = grid.width * grid.height
+        self.typecode = 'H' if size < 0xFFFF else 'I'
+        self.unreached = 0xFFFF if self.typecode == 'H' else 0xFFFFFFFF
+        self.walls = grid.occupancy.translate(_WALL_MASK)
+        self.stamp()
+        self.landmarks = array('I')
+        self.distances = []
+        if landmarks is not None:
+            for pos in landmarks:
+                self.add_landmark(grid.index(pos))
+        else:
+            self.select_landmarks(count)
+
+    @classmethod
+    def for_grid(cls, grid, count=8, cache_dir=None):
+        # Reuse a table from this process, then from the disk cache when one is configured,
+        # and only build as a last resort
+        key = (layout_key(grid), count)
+        table = _tables.get(key)
+        if table is not None:
+            _tables.move_to_end(key)
+        else:
+            cache_dir = cache_dir if cache_dir is not None else default_cache_dir()
+            path = os.path.join(cache_dir, f'{key[0]}-{count}.lmk') if cache_dir else None
+            if path is not None and os.path.exists(path):
+                table = cls.load(grid, path)
+            if table is None:
+                table = cls(grid, count)
+                if path is not None:
+                    try:
+                        table.save(path)
+                    except OSError:
+                        # A read-only cache only costs the rebuild on the next start
+                        pass
+            _tables[key] = table
+            if len(_tables) > TABLE_CACHE_SIZE:
+                _tables.popitem(last=False)
+        # The key was just taken from this grid's walls, so the table matches it as it is now
+        table.grid = grid
+        table.stamp()
+        return table
+
+    def stamp(self):
+        # Records that the grid's current version has the walls the distances came from
+        self.checked_version = self.grid.version
+        self.walls_match = True
+
+    def bounds_exact(self):
+        # Walls added after the build can only lengthen paths: lower bounds stay admissible,
+        # but a landmark detour (upper bound) may now be blocked. Walls are compared again
+        # only when the grid version has moved; dynamic obstacles are never in the table.
+        grid = self.grid
+        if grid.dynamic_obstacles:
+            return False
+        if grid.version != self.checked_version:
+            self.checked_version = grid.version
+            self.walls_match = grid.occupancy.translate(_WALL_MASK) == self.walls
+        return self.walls_match
+
+    def distance_field(self, source):
+        grid = self.grid
+        width, height = grid.width, grid.height
+        walls = self.walls
+        dist = array(self.typecode, [self.unreached]) * (width * height)
+        unreached = self.unreached
+        offsets = grid.neighbor_offsets
+
+        dist[source] = 0
+        frontier = [source]
+        depth = 0
+        while frontier:
+            depth += 1
+            layer = []
+            for node in frontier:
+                y, x = divmod(node, width)
+                interior = 0 < x < width - 1 and 0 < y < height - 1
+                for dx, dy, offset in offsets:
+                    if not interior and not (0 <= x + dx < width and 0 <= y + dy < height):
+                        continue
+                    neighbor = node + offset
+                    if not walls[neighbor] and dist[neighbor] == unreached:
+                        dist[neighbor] = depth
+                        layer.append(neighbor)
+            frontier = layer
+        return dist
+
+    def add_landmark(self, index):
+        self.landmarks.append(index)
+        self.distances.append(self.distance_field(index))
+
+    def select_landmarks(self, count):
+        # Farthest-point selection: each landmark is the free cell farthest from all
+        # earlier ones (cells of unseen components count as infinitely far)
+        walls = self.walls
+        try:
+            first = walls.index(0)
+        except ValueError:
+            return
+        nearest = self.distance_field(first)
+        for _ in range(count):
+            best, best_index = -1, -1
+            for index, distance in enumerate(nearest):
+                if distance > best and not walls[index]:
+                    best, best_index = distance, index
+            if best <= 0:
+                break
+            self.add_landmark(best_index)
+            latest = self.distances[-1]
+            nearest = array(self.typecode, map(min, nearest, latest))
+
+    def lower_bound(self, a, b):
+        # a and b are cell ids in the same component
+        bound = 0
+        unreached = self.unreached
+        for dist in self.distances:
+            da, db = dist[a], dist[b]
+            if da != unreached and db != unreached:
+                diff = da - db if da > db else db - da
+                if diff > bound:
+                    bound = diff
+        return bound
+
+    def upper_bound(self, a, b):
+        # Length of the best detour through a landmark, None when no landmark links a and b
+        best = None
+        unreached = self.unreached
+        for dist in self.distances:
+            da, db = dist[a], dist[b]
+            if da != unreached and db != unreached and (best is None or da + db < best):
+                best = da + db
+        return best
+
+    def distance(self, a, b):
+        # Exact hop distance between two positions (None if unreachable); bounds answer
+        # directly when they meet, otherwise a landmark-guided search settles it
+        grid = self.grid
+        if not grid.is_reachable(a, b):
+            return None
+        ia, ib = grid.index(a), grid.index(b)
+        lower = max(self.lower_bound(ia, ib), max(abs(a[0] - b[0]), abs(a[1] - b[1])))
+        if lower == self.upper_bound(ia, ib) and self.bounds_exact():
+            return lower
+        search = LandmarkSearch(grid, table=self)
+        node = search.search_between(ia, ib)
+        return search.cost[node] if node != -1 else None
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        header = _MAGIC + struct.pack('<IIIc', self.grid.width, self.grid.height,
+                                      len(self.landmarks), self.typecode.encode())
+        # Write to a temporary file first so a crash never leaves a truncated table behind
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as handle:
+            handle.write(header)
+            handle.write(self.key.encode())
+            self.landmarks.tofile(handle)
+            for dist in self.distances:
+                dist.tofile(handle)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, grid, path):
+        # Returns None for unreadable files or tables built for another wall layout
+        table = cls.__new__(cls)
+        table.grid = grid
+        table.key = layout_key(grid)
+        table.walls = grid.occupancy.translate(_WALL_MASK)
+        table.stamp()
+        try:
+            with open(path, 'rb') as handle:
+                header = handle.read(17)
+                if len(header) != 17 or header[:4] != _MAGIC:
+                    return None
+                width, height, count, typecode = struct.unpack('<IIIc', header[4:])
+                if (width, height) != (grid.width, grid.height):
+                    return None
+                if handle.read(len(table.key)).decode() != table.key:
+                    return None
+                table.typecode = typecode.decode()
+                table.unreached = 0xFFFF if table.typecode == 'H' else 0xFFFFFFFF
+                table.landmarks = array('I')
+                table.landmarks.fromfile(handle, count)
+                table.distances = []
+                for _ in range(count):
+                    dist = array(table.typecode)
+                    dist.fromfile(handle, width * height)
+                    table.distances.append(dist)
+        except (OSError, EOFError, ValueError, UnicodeDecodeError):
+            return None
+        return table
+
+
+# Hop-count A* whose heuristic is the larger of the Chebyshev and landmark lower bounds.
+# Nodes that cannot lie on a path shorter than the best landmark detour are never queued.
+class LandmarkSearch(_CompactSearch):
+    def __init__(self, grid, table=None, recorder=None):
+        super().__init__(grid, recorder)
+        self.table = table if table is not None else LandmarkTable.for_grid(grid)
+        # Best known hop count per cell, valid where a flag is set
+        self.cost = array('i', [0]) * (grid.width * grid.height)
+        self.pruned = 0
+
+    def search(self):
+        grid = self.grid
+        if not grid.is_reachable(grid.start, grid.target):
+            return self.make_result(False, -1)
+        node = self.search_between(grid.index(grid.start), grid.index(grid.target))
+        return self.make_result(node != -1, node)
+
+    def search_between(self, start, target):
+        grid = self.grid
+        width = grid.width
+        flags, parent, order, best = self.flags, self.parent, self.order, self.cost
+        neighbor_ids = grid.neighbor_ids
+        recorder = self.recorder
+        table = self.table
+        lower_bound = table.lower_bound
+        ty, tx = divmod(target, width)
+
+        def heuristic(node):
+            y, x = divmod(node, width)
+            chebyshev = max(abs(x - tx), abs(y - ty))
+            landmark = lower_bound(node, target)
+            return landmark if landmark > chebyshev else chebyshev
+
+        # The detour bound only holds while the grid still has the table's walls and no
+        # dynamic obstacles, which can both lengthen it
+        limit = table.upper_bound(start, target) if table.bounds_exact() else None
+
+        # f = g + h grows by 0, 1 or 2 per move with a consistent heuristic
+        frontier = BucketQueue(2)
+        frontier.cost = heuristic(start)
+        frontier.push(frontier.cost, start)
+        best[start] = 0
+        flags[start] = IN_FRONTIER
+        recorder.push(start)
+
+        while frontier:
+            _, node = frontier.pop()
+            recorder.pop(node)
+
+            if flags[node] & VISITED:
+                continue
+
+            flags[node] = VISITED
+            order.append(node)
+
+            if node == target:
+                return node
+
+            cost = best[node] + 1
+            for neighbor in neighbor_ids(node):
+                flag = flags[neighbor]
+                if flag & VISITED or (flag and cost >= best[neighbor]):
+                    continue
+                estimate = cost + heuristic(neighbor)
+                if limit is not None and estimate > limit:
+                    self.pruned += 1
+                    continue
+                best[neighbor] = cost
+                parent[neighbor] = node
+                frontier.push(estimate, neighbor)
+                flags[neighbor] = IN_FRONTIER
+                recorder.push(neighbor)
+
+        return -1
@@ -0,0 +1,41 @@
+from .bfs import BFS
+from .dfs import DFS
+from .ucs import UCS
+from .dls import DLS
+from .iddfs import IDDFS
+from .bidirectional import BidirectionalSearch
+from .wavefront import WavefrontBFS
+from .dstar_lite import DStarLite
+from .landmarks import LandmarkSearch
+from .jps import JPS
+from .hierarchical import HierarchicalSearch
+from .compact import (CompactBFS, CompactDFS, CompactUCS, CompactDLS,
+                      CompactIDDFS, CompactBidirectionalSearch)
+
+# Registry of available algorithms by name, shared by the app, the parallel runner and
+# the query server
+ALGORITHMS = {
+    "BFS": BFS,
+    "DFS": DFS,
+    "UCS": UCS,
+    "DLS": DLS,
+    "IDDFS": IDDFS,
+    "BIDIRECTIONAL": BidirectionalSearch,
+    # Integer-node variants: flat cell ids, flag bitmap and array parent table
+    "BFS_COMPACT": CompactBFS,
+    "DFS_COMPACT": CompactDFS,
+    "UCS_COMPACT": CompactUCS,
+    "DLS_COMPACT": CompactDLS,
+    "IDDFS_COMPACT": CompactIDDFS,
+    "BIDIRECTIONAL_COMPACT": CompactBidirectionalSearch,
+    # Layer-at-a-time BFS over NumPy arrays (requires numpy)
+    "BFS_WAVEFRONT": WavefrontBFS,
+    # Incremental replanning while dynamic obstacles spawn along the way
+    "DSTAR_LITE": DStarLite,
+    # A* guided by cached landmark distance tables (built once per wall layout)
+    "LANDMARK": LandmarkSearch,
+    # Jump Point Search: same hop count as BFS, expands only jump points
+    "JPS": JPS,
+    # HPA*: abstract route over cached cluster graph, legs refined with BFS inside clusters
+    "HIERARCHICAL": HierarchicalSearch,
+}
@@ -0,0 +1,109 @@
+import time
+
+# Event kinds yielded by a search's _run generator, each as a (kind, value) pair:
+#   (EXPAND, node)  node taken off the frontier and expanded
+#   (PUSH, node)    node added to the frontier
+#   (FOUND, path)   target reached; the generator finishes right after
+EXPAND = 'expand'
+PUSH = 'push'
+FOUND = 'found'
+
+
+def drain(steps):
+    # Runs a _run generator to completion and returns the SearchResult it ends with.
+    # search() passes emit=False, so the generator never yields and one next() suffices.
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+# Drives a search incrementally instead of running it to completion. Events come straight
+# from the search loop, so nothing is stored on the way; the search keeps only its own
+# explored set and parents. Callers pull events in batches, stop at a time budget,
+# pause/resume or cancel; `result` is set once the search has finished. Only searches
+# written as a _run generator (the ones with a stepper() method) can be stepped.
+class SearchStepper:
+    def __init__(self, algorithm):
+        if not hasattr(algorithm, '_run'):
+            raise TypeError(f"{type(algorithm).__name__} cannot be stepped: it has no _run "
+                            f"generator, only search()")
+        self.algorithm = algorithm
+        self._steps = algorithm._run(True)
+        self.result = None
+        self.paused = False
+        self.cancelled = False
+        self.events = 0
+
+    @property
+    def done(self):
+        return self.result is not None or self.cancelled
+
+    def _next(self):
+        try:
+            return next(self._steps)
+        except StopIteration as stop:
+            self.result = stop.value
+            return None
+
+    def step(self, n=1):
+        # Up to n events; fewer once the search finishes, none while paused or done
+        events = []
+        if self.paused or self.done:
+            return events
+        for _ in range(n):
+            event = self._next()
+            if event is None:
+                break
+            events.append(event)
+        self.events += len(events)
+        return events
+
+    def run_for(self, budget, check_every=64):
+        # Events produced within `budget` seconds; the clock is read every check_every
+        # events so very cheap steps are not dominated by timer calls
+        events = []
+        if self.paused or self.done:
+            return events
+        deadline = time.perf_counter() + budget
+        while True:
+            for _ in range(check_every):
+                event = self._next()
+                if event is None:
+                    self.events += len(events)
+                    return events
+                events.append(event)
+            if time.perf_counter() >= deadline:
+                self.events += len(events)
+                return events
+
+    def run(self):
+        # Finishes the search (even when paused) and returns its result
+        if self.cancelled:
+            return None
+        self.paused = False
+        for _ in self:
+            pass
+        return self.result
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def cancel(self):
+        # Abandons the search; its generator is closed and no result will be produced
+        if not self.done:
+            self._steps.close()
+            self.cancelled = True
+
+    def __iter__(self):
+        # Streams events until the search finishes, is paused or is cancelled
+        while not self.paused and not self.done:
+            event = self._next()
+            if event is None:
+                return
+            self.events += 1
+            yield event
@@ -1,46 +1,95 @@
-import heapq
 from . import SearchResult
+from .buckets import BucketQueue
+from .history import DeltaRecorder
+from .stepping import EXPAND, PUSH, FOUND, SearchStepper, drain
+
+INF = float('inf')
 
 class UCS:
-    def __init__(self, grid):
+    def __init__(self, grid, recorder=None, sources=None, targets=None):
         self.grid = grid
         self.explored = set()
         self.parent = {}
-        self.frontier_history = []
-        self.counter = 0
+        # Cheapest known cost to reach each node
+        self.cost = {}
+        self.recorder = recorder if recorder is not None else DeltaRecorder()
+        # Optional position sets replacing grid.start / grid.target: the search ends at the
+        # cheapest target to reach from any source
+        self.sources = sources
+        self.targets = targets
     
     def search(self):
-        frontier = [(0, self.counter, self.grid.start)]
-        self.counter += 1
-        in_frontier = {self.grid.start}
-        self.parent[self.grid.start] = None
+        return drain(self._run(False))
+    
+    def stepper(self):
+        return SearchStepper(self)
+    
+    def _run(self, emit):
+        # Generator behind search() and stepper(); yields events only when emit is set
+        grid = self.grid
+        sources = [grid.start] if self.sources is None else list(self.sources)
+        targets = {grid.target} if self.targets is None else set(self.targets)
+        if not grid.any_reachable(sources, targets):
+            # Sources and targets lie in different components: no search needed
+            return SearchResult(False, [], self.explored, self.recorder)
+        
+        explored, parent, best = self.explored, self.parent, self.cost
+        recorder = self.recorder
+        
+        # Step costs are small integers, so a ring of FIFO buckets replaces the heap; with
+        # unit costs it pops in the same order as the old (cost, counter) heap
+        frontier = BucketQueue(grid.max_step_cost())
+        uniform = grid.is_uniform_cost()
+        width, cell_costs = grid.width, grid.cost
+        straight, diagonal = grid.straight_cost, grid.diagonal_cost
+        
+        for source in sources:
+            if source in best or grid.is_blocked(source):
+                continue
+            best[source] = 0
+            parent[source] = None
+            frontier.push(0, source)
+            recorder.push(source)
+            if emit:
+                yield PUSH, source
         
         while frontier:
-            frontier_nodes = set([item[2] for item in frontier])
-            self.frontier_history.append(frontier_nodes)
-            
-            cost, _, node = heapq.heappop(frontier)
-            in_frontier.discard(node)
+            cost, node = frontier.pop()
+            recorder.pop(node)
             
-            if node in self.explored:
+            # Entries superseded by a cheaper route stay queued and are skipped here
+            if node in explored:
                 continue
             
-            self.explored.add(node)
+            explored.add(node)
+            if emit:
+                yield EXPAND, node
             
-            if node == self.grid.target:
+            if node in targets:
                 path = self.reconstruct_path(node)
-                return SearchResult(True, path, self.explored, self.frontier_history)
+                if emit:
+                    yield FOUND, path
+                return SearchResult(True, path, explored, recorder)
             
-            neighbors = self.grid.get_neighbors(node)
-            for neighbor in neighbors:
-                if neighbor not in self.explored and neighbor not in in_frontier:
-                    self.parent[neighbor] = node
+            x, y = node
+            for neighbor in grid.get_neighbors(node):
+                if neighbor in explored:
+                    continue
+                if uniform:
                     new_cost = cost + 1
-                    heapq.heappush(frontier, (new_cost, self.counter, neighbor))
-                    self.counter += 1
-                    in_frontier.add(neighbor)
+                else:
+                    nx, ny = neighbor
+                    step = diagonal if nx != x and ny != y else straight
+                    new_cost = cost + cell_costs[ny * width + nx] * step
+                if new_cost < best.get(neighbor, INF):
+                    best[neighbor] = new_cost
+                    parent[neighbor] = node
+                    frontier.push(new_cost, neighbor)
+                    recorder.push(neighbor)
+                    if emit:
+                        yield PUSH, neighbor
         
-        return SearchResult(False, [], self.explored, self.frontier_history)
+        return SearchResult(False, [], explored, recorder)
     
     def reconstruct_path(self, node):
         path = []
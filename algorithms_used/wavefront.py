@@ -0,0 +1,132 @@
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except Exception:
+    # Keep the package importable without numpy; WavefrontBFS raises when used.
+    np = None
+    NUMPY_AVAILABLE = False
+from . import SearchResult
+from .history import NullRecorder
+
+
+def wavefront_distance_field(grid, sources):
+    # Whole-map hop distances from the nearest source in one pass: every layer is grown
+    # for all sources at once by shifting the frontier array. Returns an int32 array
+    # indexed like grid.occupancy, -1 where no source reaches.
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError(
+            "numpy is not available. Install it with `pip install numpy` to use wavefront_distance_field."
+        )
+    if not grid.is_uniform_cost():
+        raise ValueError("wavefront_distance_field counts hops; use distance_field on weighted grids")
+
+    width, height = grid.width, grid.height
+    free = np.frombuffer(grid.occupancy, dtype=np.uint8) == 0
+    dist = np.full(width * height, -1, dtype=np.int32)
+    seeds = [grid.index(pos) for pos in sources if not grid.is_blocked(pos)]
+    frontier = np.unique(np.array(seeds, dtype=np.int64))
+    dist[frontier] = 0
+
+    depth = 0
+    while frontier.size:
+        depth += 1
+        fy, fx = np.divmod(frontier, width)
+        layer = []
+        for dx, dy, offset in grid.neighbor_offsets:
+            in_bounds = np.ones(frontier.size, dtype=bool)
+            if dx:
+                in_bounds &= (fx + dx >= 0) & (fx + dx < width)
+            if dy:
+                in_bounds &= (fy + dy >= 0) & (fy + dy < height)
+            reached = frontier[in_bounds] + offset
+            reached = reached[free[reached] & (dist[reached] < 0)]
+            dist[reached] = depth
+            layer.append(reached)
+        frontier = np.concatenate(layer)
+    return dist
+
+
+class WavefrontBFS:
+    def __init__(self, grid, recorder=None):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError(
+                "numpy is not available. Install it with `pip install numpy` to use WavefrontBFS."
+            )
+        self.grid = grid
+        self.recorder = recorder if recorder is not None else NullRecorder()
+        self.visited = None
+        # Index into grid.neighbor_offsets of the move that first reached each cell, -1 if unreached
+        self.parent_direction = None
+        self.layers = 0
+
+    def search(self):
+        grid = self.grid
+        if not grid.is_reachable(grid.start, grid.target):
+            return SearchResult(False, [], set(), self.recorder)
+
+        width, height = grid.width, grid.height
+        start = grid.index(grid.start)
+        target = grid.index(grid.target)
+
+        free = np.frombuffer(grid.occupancy, dtype=np.uint8) == 0
+        visited = np.zeros(width * height, dtype=bool)
+        parent_direction = np.full(width * height, -1, dtype=np.int8)
+        self.visited = visited
+        self.parent_direction = parent_direction
+
+        frontier = np.array([start], dtype=np.int64)
+        visited[start] = True
+
+        while frontier.size and not visited[target]:
+            fy, fx = np.divmod(frontier, width)
+            layer = []
+            # Shift the whole layer by each move in get_neighbors order; the first move to
+            # reach a cell claims it, exactly one parent direction per cell
+            for direction, (dx, dy, offset) in enumerate(grid.neighbor_offsets):
+                in_bounds = np.ones(frontier.size, dtype=bool)
+                if dx:
+                    in_bounds &= (fx + dx >= 0) & (fx + dx < width)
+                if dy:
+                    in_bounds &= (fy + dy >= 0) & (fy + dy < height)
+                reached = frontier[in_bounds] + offset
+                reached = reached[free[reached] & ~visited[reached]]
+                visited[reached] = True
+                parent_direction[reached] = direction
+                layer.append(reached)
+            frontier = np.concatenate(layer)
+            self.layers += 1
+
+        # The visited bitmap and parent directions back the result; positions are built on access
+        return SearchResult.deferred(bool(visited[target]), self, grid.target, self.recorder)
+
+    def reconstruct_path(self, node):
+        grid = self.grid
+        path = []
+        current = grid.index(node)
+        while True:
+            path.append(grid.position(current))
+            direction = self.parent_direction[current]
+            if direction < 0:
+                break
+            current -= grid.neighbor_offsets[direction][2]
+        path.reverse()
+        return path
+
+    def path_length(self, node):
+        grid = self.grid
+        offsets = grid.neighbor_offsets
+        length = 1
+        current = grid.index(node)
+        direction = self.parent_direction[current]
+        while direction >= 0:
+            current -= offsets[direction][2]
+            direction = self.parent_direction[current]
+            length += 1
+        return length
+
+    def explored_cells(self):
+        position = self.grid.position
+        return {position(node) for node in np.flatnonzero(self.visited).tolist()}
+
+    def explored_count(self):
+        return int(np.count_nonzero(self.visited))
@@ -1,12 +1,14 @@
 from grid import Grid
-from algorithms_folder.bfs import BFS
-from algorithms_folder.dfs import DFS
-from algorithms_folder.ucs import UCS
-from algorithms_folder.dls import DLS
-from algorithms_folder.iddfs import IDDFS
-from algorithms_folder.bidirectional import BidirectionalSearch
-from visualizer_folder import GridVisualizer
+from algorithms_folder.batch import BatchBFS
+from algorithms_folder.instrumentation import run_instrumented
+from algorithms_folder.history import NullRecorder
+from algorithms_folder.registry import ALGORITHMS
+from visualizer_folder import GridVisualizer, export_search
+from parallel import run_jobs, summarize, print_comparison_table
+from path_cache import PathCache
+import json
 import random
+from typing import Optional
 
 
 class GridPathfinder:
@@ -36,16 +38,15 @@ class GridPathfinder:
         print(f"  Start: {start}, Target: {target}")
         
         # Dictionary of available algorithms
-        self.algorithms = {
-            "BFS": BFS,
-            "DFS": DFS,
-            "UCS": UCS,
-            "DLS": DLS,
-            "IDDFS": IDDFS,
-            "BIDIRECTIONAL": BidirectionalSearch,
-        }
+        self.algorithms = dict(ALGORITHMS)
+        
+        # Results of earlier runs, reused while the grid version (walls, obstacles) allows
+        self.path_cache = PathCache()
     
-    def run_algorithm(self, algorithm_name: str, show_visualization: bool = True) -> None:
+    def run_algorithm(self, algorithm_name: str, show_visualization: bool = True,
+                      export_path: Optional[str] = None, frame_skip: int = 1,
+                      instrument: bool = False, live: bool = False,
+                      use_cache: bool = True) -> None:
    
         if algorithm_name not in self.algorithms:
             print(f"✗ Algorithm '{algorithm_name}' not found!")
@@ -62,11 +63,42 @@ class GridPathfinder:
         try:
             # Create algorithm instance
             algorithm_class = self.algorithms[algorithm_name]
-            algorithm = algorithm_class(self.grid)
             
-            # Execute search
-            print("Executing search...")
-            result = algorithm.search()
+            # Live runs draw events while the search produces them; nothing is recorded.
+            # Only searches with a stepper() can do that.
+            if live and not hasattr(algorithm_class, 'stepper'):
+                steppable = [name for name, cls in self.algorithms.items() if hasattr(cls, 'stepper')]
+                print(f"✗ {algorithm_name} has no live mode")
+                print(f"  Live-capable algorithms: {', '.join(steppable)}")
+                return
+            if live and show_visualization:
+                print("\nSearching live... (SPACE pauses, ESC cancels)")
+                visualizer = GridVisualizer(self.grid, animation_delay=0.0)
+                stepper = algorithm_class(self.grid, recorder=NullRecorder()).stepper()
+                result = visualizer.visualize_live(algorithm_name, stepper)
+                visualizer.close()
+                if result is None:
+                    print("✗ Search cancelled")
+                else:
+                    self._print_results(algorithm_name, result)
+                return
+            
+            # Execute search (instrumented runs also collect counters and timers, so they
+            # always search afresh)
+            result = None
+            if use_cache and not instrument:
+                result = self.path_cache.get(self.grid, algorithm_name)
+            if result is not None:
+                print("Reusing cached result (grid unchanged along the path)...")
+            elif instrument:
+                print("Executing search...")
+                result = run_instrumented(algorithm_class, self.grid)
+            else:
+                print("Executing search...")
+                version = self.grid.version
+                result = algorithm_class(self.grid).search()
+                if use_cache:
+                    self.path_cache.put(self.grid, algorithm_name, result, version)
             
             # Print results
             self._print_results(algorithm_name, result)
@@ -77,18 +109,49 @@ class GridPathfinder:
                 visualizer = GridVisualizer(self.grid, animation_delay=0.01)
                 visualizer.visualize_algorithm(algorithm_name, result)
                 visualizer.close()
+            
+            # Export works without a display (.gif, .png frame pattern or raw .rgb stream)
+            if export_path:
+                frames = export_search(self.grid, result, export_path, frame_skip=frame_skip)
+                print(f"✓ Exported {frames} frames to {export_path}")
         
         except Exception as e:
             print(f"✗ Error running algorithm: {e}")
             import traceback
             traceback.print_exc()
     
-    def run_all_algorithms(self, show_visualization: bool = False) -> None:
+    def run_batch(self, queries, counts_only: bool = False):
+        """
+        Answer many (start, target) queries on the current grid.
+        
+        Queries sharing a start position are served from one BFS tree. Results are
+        yielded as (query_index, SearchResult) pairs as soon as each target is
+        reached, so the order differs from the input order.
+        
+        Args:
+            queries: Iterable of ((start_x, start_y), (target_x, target_y)) pairs
+            counts_only: Keep only found, path_length and total_nodes_explored per result
+        """
+        return BatchBFS(self.grid, counts_only=counts_only).search_many(queries)
+    
+    def run_all_algorithms(self, show_visualization: bool = False, parallel: bool = False,
+                           max_workers: int = None, json_path: str = None) -> None:
 
         print(f"\n{'='*60}")
         print("Running ALL algorithms for comparison...")
         print(f"{'='*60}\n")
         
+        if parallel:
+            # One process per algorithm; the grid is shared once instead of pickled per job
+            if show_visualization:
+                print("  Visualization is not available in parallel mode")
+            records = run_jobs([(self.grid, 0)], self.algorithms, max_workers)
+            if json_path:
+                with open(json_path, "w") as handle:
+                    json.dump(records, handle, indent=2)
+            self._print_comparison_table(summarize(records))
+            return
+        
         results_summary = {}
         
         for algorithm_name in self.algorithms.keys():
@@ -104,7 +167,7 @@ class GridPathfinder:
                 # Store results
                 results_summary[algorithm_name] = {
                     "found": result.found,
-                    "path_length": len(result.path) if result.path else 0,
+                    "path_length": result.path_length,
                     "nodes_explored": result.total_nodes_explored,
                 }
                 
@@ -130,35 +193,42 @@ class GridPathfinder:
         if result.found:
             print(f"✓ Target found!")
             print(f"  Path length: {len(result.path)} steps")
+            if not self.grid.is_uniform_cost():
+                print(f"  Path cost: {self.grid.path_cost(result.path)}")
         else:
             print(f"✗ Target not found")
         
         print(f"  Nodes explored: {result.total_nodes_explored}")
+        if result.cells_scanned is not None:
+            print(f"  Cells scanned while jumping: {result.cells_scanned}")
         
         if result.dynamic_obstacles_encountered:
             print(f"  Dynamic obstacles encountered: {len(result.dynamic_obstacles_encountered)}")
             print(f"    Positions: {result.dynamic_obstacles_encountered}")
         
+        if result.replans:
+            repair = sum(replan.expansions for replan in result.replans)
+            print(f"  Replans: {len(result.replans)} ({repair} nodes re-expanded)")
+            measured = [replan for replan in result.replans if replan.saved is not None]
+            if measured:
+                full = sum(replan.full_rerun_expansions for replan in measured)
+                saved = sum(replan.saved for replan in measured)
+                print(f"    Full reruns would have expanded {full} nodes ({saved} saved)")
+        
+        if result.stats is not None:
+            stats = result.stats
+            print(f"  Instrumentation:")
+            print(f"    Pops: {stats.pops}  Pushes: {stats.pushes}  Duplicate skips: {stats.duplicate_skips}")
+            print(f"    Peak frontier: {stats.peak_frontier}  Neighbor calls: {stats.neighbor_calls}")
+            print(f"    Time: {stats.total_time * 1000:.2f} ms "
+                  f"(neighbors {stats.neighbor_time * 1000:.2f} ms, "
+                  f"bookkeeping {stats.bookkeeping_time * 1000:.2f} ms)")
+        
         print(f"{'─'*60}\n")
     
-    def _print_comparison_table(self, results: dict) -> None:
-
-        print(f"\n{'='*80}")
-        print("COMPARISON OF ALL ALGORITHMS")
-        print(f"{'='*80}")
-        
-        # Print header
-        print(f"{'Algorithm':<20} {'Found':<8} {'Path Length':<15} {'Nodes Explored':<15}")
-        print(f"{'-'*80}")
-        
-        # Print each result
-        for algo_name, metrics in results.items():
-            found_str = "Yes" if metrics["found"] else "No"
-            path_len = metrics["path_length"] if metrics["path_length"] > 0 else "N/A"
-            
-            print(f"{algo_name:<20} {found_str:<8} {str(path_len):<15} {metrics['nodes_explored']:<15}")
-        
-        print(f"{'='*80}\n")
+    # Kept here for callers of the old name; the table lives in parallel.py so the CLI
+    # runners can print it without importing the app
+    _print_comparison_table = staticmethod(print_comparison_table)
     
     def interactive_menu(self) -> None:
 
@@ -0,0 +1,121 @@
+"""
+Seeded map corpus shared by the benchmarks.
+
+Every map is rebuilt from (kind, size, seed), so the same corpus can be
+regenerated on any machine instead of being stored.
+"""
+import random
+from typing import Iterator, List, NamedTuple, Tuple
+
+from grid import Grid
+
+KINDS = ("open", "maze", "rooms", "dense")
+
+
+class MapSpec(NamedTuple):
+
+    kind: str
+    size: int
+    seed: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.kind}-{self.size}-s{self.seed}"
+
+
+def endpoints(kind: str, size: int) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+
+    # Maze passages sit on odd coordinates, so both endpoints are moved onto one
+    far = size - 2 if (size - 2) % 2 else size - 3
+    if kind == "maze":
+        return (1, 1), (far, far)
+    return (1, 1), (size - 2, size - 2)
+
+
+def build_open(grid: Grid, size: int) -> None:
+
+    grid.add_walls_randomly(size * size // 20)
+
+
+def build_dense(grid: Grid, size: int) -> None:
+
+    grid.add_walls_randomly(size * size * 3 // 10)
+
+
+def build_maze(grid: Grid, size: int) -> None:
+
+    # Iterative recursive-backtracker on the odd-coordinate lattice; every even row and
+    # column starts as wall and carved passages are never walled in
+    passage = [[False] * size for _ in range(size)]
+    cells = [(x, y) for y in range(1, size - 1, 2) for x in range(1, size - 1, 2)]
+    if not cells:
+        return
+    first = cells[0]
+    passage[first[1]][first[0]] = True
+    stack = [first]
+    while stack:
+        x, y = stack[-1]
+        options = [(x + dx, y + dy, x + dx // 2, y + dy // 2)
+                   for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                   if 0 < x + dx < size - 1 and 0 < y + dy < size - 1
+                   and not passage[y + dy][x + dx]]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny, wx, wy = random.choice(options)
+        passage[wy][wx] = True
+        passage[ny][nx] = True
+        stack.append((nx, ny))
+
+    for y in range(size):
+        row = passage[y]
+        for x in range(size):
+            if not row[x]:
+                grid.add_wall(x, y)
+
+
+def build_rooms(grid: Grid, size: int, room: int = 10) -> None:
+
+    # Wall lines every `room` cells with one door in each wall segment, plus light clutter
+    lines = list(range(room, size - 1, room))
+    bounds = [-1] + lines + [size]
+    doors = set()
+    for line in lines:
+        for low, high in zip(bounds, bounds[1:]):
+            if high - low > 1:
+                door = random.randrange(low + 1, high)
+                doors.add((door, line))
+                doors.add((line, door))
+
+    for line in lines:
+        for i in range(size):
+            for pos in ((i, line), (line, i)):
+                if pos not in doors:
+                    grid.add_wall(*pos)
+
+    grid.add_walls_randomly(size * size // 50)
+
+
+BUILDERS = {
+    "open": build_open,
+    "maze": build_maze,
+    "rooms": build_rooms,
+    "dense": build_dense,
+}
+
+
+def build_map(spec: MapSpec) -> Grid:
+
+    random.seed(spec.seed)
+    start, target = endpoints(spec.kind, spec.size)
+    grid = Grid(spec.size, spec.size, start, target, 0.0)
+    BUILDERS[spec.kind](grid, spec.size)
+    return grid
+
+
+def corpus(kinds: List[str], sizes: List[int], seeds: List[int]) -> Iterator[MapSpec]:
+
+    for size in sizes:
+        for kind in kinds:
+            for seed in seeds:
+                yield MapSpec(kind, size, seed)
@@ -0,0 +1,227 @@
+"""
+Time the search algorithms on a seeded map corpus and track regressions.
+
+Each (map, algorithm) record holds the median wall time, nodes per second,
+tracemalloc peak memory and whether the path is as short as BFS's. Records can
+be saved as a JSON baseline and compared against a later run.
+
+Usage:
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.2
+    python -m benchmarks.suite --preset full --kinds open maze
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from grid import Grid
+from algorithms_used import (BFS, DFS, UCS, DLS, IDDFS, BidirectionalSearch, JPS,
+                             NullRecorder)
+from benchmarks.corpus import KINDS, MapSpec, build_map, corpus
+
+PRESETS = {
+    "quick": [50, 200],
+    "default": [50, 200, 1000],
+    "full": [50, 200, 1000, 4000],
+}
+
+# The searches run without frontier history by default so timings measure the search itself
+ALGORITHMS: Dict[str, Callable] = {
+    "BFS": BFS,
+    "DFS": DFS,
+    "UCS": UCS,
+    "DLS": DLS,
+    "IDDFS": IDDFS,
+    "BIDIRECTIONAL": BidirectionalSearch,
+    "JPS": JPS,
+}
+
+# Longest shortest path (in cells) each algorithm is run on; IDDFS repeats the search once
+# per depth, so its cost grows with path length and it takes tens of seconds past ~200
+DEPTH_LIMITS = {
+    "IDDFS": 100,
+}
+
+
+def run_once(algorithm_class: Callable, grid: Grid, history: bool):
+
+    grid.clear_dynamic_obstacles()
+    algorithm = algorithm_class(grid) if history else algorithm_class(grid, recorder=NullRecorder())
+    started = time.perf_counter()
+    result = algorithm.search()
+    return result, time.perf_counter() - started
+
+
+def measure_peak(algorithm_class: Callable, grid: Grid, history: bool) -> int:
+
+    # Separate run: tracemalloc slows allocation-heavy code and would skew the timings
+    tracemalloc.start()
+    try:
+        run_once(algorithm_class, grid, history)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def is_valid_path(grid: Grid, path: List) -> bool:
+
+    if not path or path[0] != grid.start or path[-1] != grid.target:
+        return False
+    for a, b in zip(path, path[1:]):
+        if grid.is_blocked(b) or max(abs(a[0] - b[0]), abs(a[1] - b[1])) != 1:
+            return False
+    return True
+
+
+def benchmark_map(spec: MapSpec, algorithms: Dict[str, Callable], repeat: int,
+                  history: bool, memory: bool) -> List[dict]:
+
+    grid = build_map(spec)
+    reference, _ = run_once(BFS, grid, False)
+    shortest = len(reference.path) if reference.found else None
+
+    records = []
+    for name, algorithm_class in algorithms.items():
+        record = {"map": spec.name, "kind": spec.kind, "size": spec.size, "seed": spec.seed,
+                  "algorithm": name}
+        limit = DEPTH_LIMITS.get(name)
+        if limit is not None and (shortest is None or shortest > limit):
+            record["skipped"] = True
+            records.append(record)
+            continue
+
+        times = []
+        for _ in range(repeat):
+            result, elapsed = run_once(algorithm_class, grid, history)
+            times.append(elapsed)
+        seconds = statistics.median(times)
+
+        record.update({
+            "found": result.found,
+            "path_length": len(result.path),
+            "shortest": shortest,
+            "valid": is_valid_path(grid, result.path) if result.found else not result.path,
+            "optimal": result.found == reference.found
+                       and (not result.found or len(result.path) == shortest),
+            "nodes_explored": result.total_nodes_explored,
+            "seconds": seconds,
+            "nodes_per_second": result.total_nodes_explored / seconds if seconds > 0 else None,
+            "peak_bytes": measure_peak(algorithm_class, grid, history) if memory else None,
+        })
+        records.append(record)
+    return records
+
+
+def compare(records: List[dict], baseline: List[dict], threshold: float,
+            min_seconds: float) -> List[str]:
+    """
+    Describe every record that got worse than its baseline by more than threshold.
+
+    Timings below min_seconds are ignored as noise. Node counts and optimality are
+    deterministic, so any increase or loss is reported.
+    """
+    previous = {(r["map"], r["algorithm"]): r for r in baseline if not r.get("skipped")}
+    regressions = []
+
+    for record in records:
+        if record.get("skipped"):
+            continue
+        old = previous.get((record["map"], record["algorithm"]))
+        if old is None:
+            continue
+        label = f"{record['algorithm']} on {record['map']}"
+
+        if old["optimal"] and not record["optimal"]:
+            regressions.append(f"{label}: path no longer optimal "
+                               f"({record['path_length']} vs {record['shortest']})")
+        if record["valid"] is False:
+            regressions.append(f"{label}: returned an invalid path")
+        if record["nodes_explored"] > old["nodes_explored"]:
+            regressions.append(f"{label}: nodes explored {old['nodes_explored']} -> "
+                               f"{record['nodes_explored']}")
+        if max(record["seconds"], old["seconds"]) >= min_seconds \
+                and record["seconds"] > old["seconds"] * (1 + threshold):
+            regressions.append(f"{label}: time {old['seconds']:.4f}s -> {record['seconds']:.4f}s "
+                               f"(+{record['seconds'] / old['seconds'] - 1:.0%})")
+        if record.get("peak_bytes") and old.get("peak_bytes") \
+                and record["peak_bytes"] > old["peak_bytes"] * (1 + threshold):
+            regressions.append(f"{label}: peak memory {old['peak_bytes']} -> "
+                               f"{record['peak_bytes']} bytes")
+    return regressions
+
+
+def print_records(records: List[dict]) -> None:
+
+    print(f"{'Map':<20} {'Algorithm':<15} {'Found':<7} {'Path':<8} {'Optimal':<8} "
+          f"{'Nodes':<10} {'Time (s)':<10} {'Nodes/s':<12} {'Peak (KiB)':<10}")
+    print(f"{'-'*106}")
+    for record in records:
+        if record.get("skipped"):
+            print(f"{record['map']:<20} {record['algorithm']:<15} skipped (depth limit)")
+            continue
+        rate = f"{record['nodes_per_second']:.0f}" if record["nodes_per_second"] else "-"
+        peak = f"{record['peak_bytes'] / 1024:.0f}" if record["peak_bytes"] is not None else "-"
+        print(f"{record['map']:<20} {record['algorithm']:<15} {str(record['found']):<7} "
+              f"{record['path_length']:<8} {str(record['optimal']):<8} {record['nodes_explored']:<10} "
+              f"{record['seconds']:<10.4f} {rate:<12} {peak:<10}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="default")
+    parser.add_argument("--sizes", type=int, nargs="+", default=None, help="Overrides --preset")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--algorithms", nargs="+", choices=sorted(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per record (median is kept)")
+    parser.add_argument("--history", action="store_true", help="Keep the default frontier recorders")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="Skip the tracemalloc run")
+    parser.add_argument("--save", default=None, help="Write records as a JSON baseline")
+    parser.add_argument("--compare", default=None, help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative slowdown / memory growth before flagging")
+    parser.add_argument("--min-seconds", type=float, default=0.005,
+                        help="Ignore timing changes on runs shorter than this")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or PRESETS[args.preset]
+    algorithms = {name: ALGORITHMS[name] for name in args.algorithms}
+
+    records = []
+    for spec in corpus(args.kinds, sizes, args.seeds):
+        records.extend(benchmark_map(spec, algorithms, args.repeat, args.history, args.memory))
+    print_records(records)
+
+    if args.save:
+        with open(args.save, "w") as handle:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeat": args.repeat,
+                "history": args.history,
+                "records": records,
+            }, handle, indent=2)
+        print(f"\nSaved {len(records)} records to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)["records"]
+        regressions = compare(records, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"  ✗ {line}")
+            return 1
+        print(f"\n✓ No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
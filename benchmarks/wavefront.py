@@ -0,0 +1,63 @@
+"""
+Compare WavefrontBFS against the node-at-a-time BFS on square grids.
+
+Usage:
+    python -m benchmarks.wavefront --sizes 100 500 1000 --density 0.1
+"""
+import argparse
+import random
+import time
+
+from grid import Grid
+from algorithms_used import BFS, WavefrontBFS, NullRecorder
+
+
+def build_grid(size: int, density: float, seed: int) -> Grid:
+
+    random.seed(seed)
+    grid = Grid(size, size, (0, 0), (size - 1, size - 1))
+    grid.add_walls_randomly(int(size * size * density))
+    return grid
+
+
+def time_search(algorithm) -> tuple:
+
+    start = time.perf_counter()
+    result = algorithm.search()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 250, 500, 1000, 2000, 4000])
+    parser.add_argument("--density", type=float, default=0.1, help="Fraction of cells turned into walls")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-bfs-above", type=int, default=None,
+                        help="Only time WavefrontBFS for sizes larger than this")
+    args = parser.parse_args()
+
+    print(f"{'Size':<12} {'BFS (s)':<12} {'Wavefront (s)':<15} {'Speedup':<10} {'Path length':<12}")
+    print(f"{'-'*64}")
+
+    for size in args.sizes:
+        grid = build_grid(size, args.density, args.seed)
+        wave_result, wave_time = time_search(WavefrontBFS(grid))
+
+        if args.skip_bfs_above is not None and size > args.skip_bfs_above:
+            print(f"{f'{size}x{size}':<12} {'-':<12} {wave_time:<15.3f} {'-':<10} {len(wave_result.path):<12}")
+            continue
+
+        bfs_result, bfs_time = time_search(BFS(grid, recorder=NullRecorder()))
+        if len(bfs_result.path) != len(wave_result.path):
+            raise AssertionError(
+                f"Path length mismatch on {size}x{size}: BFS {len(bfs_result.path)}, "
+                f"wavefront {len(wave_result.path)}"
+            )
+
+        speedup = bfs_time / wave_time if wave_time > 0 else float("inf")
+        print(f"{f'{size}x{size}':<12} {bfs_time:<12.3f} {wave_time:<15.3f} {speedup:<10.1f} {len(wave_result.path):<12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import random
+from array import array
+from collections import deque
 from typing import List, Tuple, Set, Optional
 from dataclasses import dataclass
 from enum import Enum
@@ -32,11 +34,40 @@ class Cell:
         return self.x == other.x and self.y == other.y
 
 
+# Occupancy flags stored per cell in Grid.occupancy
+FREE = 0
+WALL_FLAG = 1
+DYNAMIC_FLAG = 2
+
+# Neighbor displacement table (dx, dy) in the exact order used by get_neighbors:
+# Up, Right, Down, BottomRight, Left, TopLeft, TopRight, BottomLeft
+NEIGHBOR_MOVES = (
+    (0, -1),
+    (1, 0),
+    (0, 1),
+    (1, 1),
+    (-1, 0),
+    (-1, -1),
+    (1, -1),
+    (-1, 1),
+)
+
+# The eight cells around a cell in circular order (N, NE, E, SE, S, SW, W, NW)
+RING = ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))
+
+# Occupancy byte -> 1 for a static wall, 0 otherwise (wall_mask)
+_WALL_MASK = bytes(flags & WALL_FLAG for flags in range(256))
+
+# Newly blocked cells remembered for blocked_since; older changes fall off the log
+CHANGE_LOG_SIZE = 4096
+
+
 class Grid:
 
     
     def __init__(self, width: int, height: int, start: Tuple[int, int], 
-                 target: Tuple[int, int], dynamic_spawn_probability: float = 0.02):
+                 target: Tuple[int, int], dynamic_spawn_probability: float = 0.02,
+                 track_components: bool = True):
   
         # Initialize basic grid parameters
         self.width = width
@@ -49,11 +80,104 @@ class Grid:
         self.dynamic_obstacles: Set[Tuple[int, int]] = set()        # Temporary dynamic obstacles
         self.dynamic_spawn_probability = dynamic_spawn_probability  # Spawn chance per iteration
         
+        # Flat occupancy array indexed by y * width + x (FREE / WALL_FLAG / DYNAMIC_FLAG bits)
+        self.occupancy = bytearray(width * height)
+        
+        # Terrain cost of entering each cell (1-255), indexed like occupancy. A move costs the
+        # entered cell's cost times straight_cost or diagonal_cost; all 1 means unit costs
+        self.cost = bytearray(b'\x01') * (width * height)
+        self.straight_cost = 1
+        self.diagonal_cost = 1
+        self._weighted_cells = 0
+        
+        # Precomputed (dx, dy, index offset) table so expansion needs no per-call list building
+        self.neighbor_offsets = tuple((dx, dy, dy * width + dx) for dx, dy in NEIGHBOR_MOVES)
+        
+        # Connected-component labels of free cells, filled lazily one component at a time.
+        # -1 means unlabeled; labels in _stale_labels may have been split by a new obstacle.
+        self.track_components = track_components
+        self.component = array('i', [-1]) * (width * height)
+        self._stale_labels: Set[int] = set()
+        self._next_label = 0
+        
+        # Pool of free cells eligible for walls/obstacles (start and target excluded):
+        # _free_cells holds cell ids, _free_slot maps a cell id to its slot or -1
+        self._free_cells = array('i', range(width * height))
+        self._free_slot = array('i', range(width * height))
+        
+        # Incremented whenever the walkable cells or the costs change. _blocked_log holds
+        # (version, cell id) for cells that became blocked; changes that free cells or alter
+        # costs cannot be checked cell by cell and move _unlisted_version forward instead.
+        self.version = 0
+        self._blocked_log = deque(maxlen=CHANGE_LOG_SIZE)
+        self._unlisted_version = 0
+        
         # Validate that start and target are within grid bounds
         if not self._is_valid_position(start):
             raise ValueError(f"Start position {start} is out of grid bounds ({width}×{height})")
         if not self._is_valid_position(target):
             raise ValueError(f"Target position {target} is out of grid bounds ({width}×{height})")
+        
+        self._take_free(self.index(start))
+        self._take_free(self.index(target))
+    
+    @classmethod
+    def from_occupancy(cls, width: int, height: int, start: Tuple[int, int],
+                       target: Tuple[int, int], occupancy, 
+                       dynamic_spawn_probability: float = 0.02, costs=None) -> "Grid":
+  
+        # Rebuild a grid from a flat occupancy buffer (only static walls are restored)
+        grid = cls(width, height, start, target, dynamic_spawn_probability)
+        for index, flags in enumerate(occupancy):
+            if flags & WALL_FLAG:
+                y, x = divmod(index, width)
+                grid.add_wall(x, y)
+        if costs is not None:
+            grid.cost[:] = costs
+            grid._weighted_cells = len(grid.cost) - grid.cost.count(1)
+            grid._changed()
+        return grid
+    
+    def _take_free(self, index: int) -> None:
+
+        # Swap-remove from the pool in O(1)
+        slot = self._free_slot[index]
+        if slot == -1:
+            return
+        last = self._free_cells.pop()
+        if last != index:
+            self._free_cells[slot] = last
+            self._free_slot[last] = slot
+        self._free_slot[index] = -1
+    
+    def _return_free(self, index: int) -> None:
+
+        if self._free_slot[index] == -1:
+            self._free_slot[index] = len(self._free_cells)
+            self._free_cells.append(index)
+    
+    def _changed(self, blocked: int = -1) -> None:
+
+        self.version += 1
+        if blocked == -1:
+            self._unlisted_version = self.version
+            return
+        log = self._blocked_log
+        if len(log) == log.maxlen:
+            # The oldest entry is about to drop out; versions before it can't be listed anymore
+            self._unlisted_version = max(self._unlisted_version, log[0][0])
+        log.append((self.version, blocked))
+    
+    def blocked_since(self, version: int) -> Optional[Set[int]]:
+        """
+        Cell ids blocked after `version`, when blocking is all that has changed since.
+        
+        Returns None when cells were freed, costs changed or the change log no longer
+        reaches back to `version`; callers must then treat everything as changed.
+        """
+        if version < self._unlisted_version:
+            return None
+        return {index for changed, index in self._blocked_log if changed > version}
     
     def _is_valid_position(self, pos: Tuple[int, int]) -> bool:
 
@@ -67,54 +191,102 @@ class Grid:
         # Only add wall if position is valid and not start/target
         if self._is_valid_position(pos) and pos != self.start and pos != self.target:
             self.walls.add(pos)
+            index = y * self.width + x
+            was_free = not self.occupancy[index]
+            self.occupancy[index] |= WALL_FLAG
+            if was_free:
+                self._take_free(index)
+                self._on_cell_blocked(x, y)
+                self._changed(index)
+    
+    def set_cost(self, x: int, y: int, cost: int) -> None:
+
+        if not 1 <= cost <= 255:
+            raise ValueError(f"Terrain cost must be between 1 and 255, got {cost}")
+        if not self._is_valid_position((x, y)):
+            raise ValueError(f"Position {(x, y)} is out of grid bounds ({self.width}×{self.height})")
+        index = y * self.width + x
+        if self.cost[index] == cost:
+            return
+        self._weighted_cells += (cost != 1) - (self.cost[index] != 1)
+        self.cost[index] = cost
+        self._changed()
+    
+    def get_cost(self, pos: Tuple[int, int]) -> int:
+
+        x, y = pos
+        return self.cost[y * self.width + x]
+    
+    def set_move_costs(self, straight: int = 1, diagonal: int = 1) -> None:
+        """
+        Set the integer multipliers for straight and diagonal moves.
+        
+        Costs stay integral so UCS can use a bucket queue; e.g. (5, 7) approximates
+        Euclidean move lengths.
+        """
+        if straight < 1 or diagonal < 1:
+            raise ValueError(f"Move costs must be at least 1, got ({straight}, {diagonal})")
+        if (straight, diagonal) != (self.straight_cost, self.diagonal_cost):
+            self.straight_cost = straight
+            self.diagonal_cost = diagonal
+            self._changed()
+    
+    def is_uniform_cost(self) -> bool:
+
+        # Every move costs 1: UCS order and results are the same as on an unweighted grid
+        return not self._weighted_cells and self.straight_cost == self.diagonal_cost == 1
+    
+    def max_step_cost(self) -> int:
+
+        return max(self.cost) * max(self.straight_cost, self.diagonal_cost)
+    
+    def move_cost(self, a: Tuple[int, int], b: Tuple[int, int]) -> int:
+
+        multiplier = self.diagonal_cost if a[0] != b[0] and a[1] != b[1] else self.straight_cost
+        return self.cost[b[1] * self.width + b[0]] * multiplier
+    
+    def path_cost(self, path: List[Tuple[int, int]]) -> int:
+
+        return sum(self.move_cost(a, b) for a, b in zip(path, path[1:]))
     
-    def add_walls_randomly(self, count: int) -> None:
+    def add_walls_randomly(self, count: int, rng: Optional[random.Random] = None) -> None:
    
-        # Calculate max attempts to prevent infinite loop (10x the target count)
-        max_attempts = count * 10
-        added = 0
-        attempts = 0
-        
-        # Keep trying to add walls until we reach target count or max attempts
-        while added < count and attempts < max_attempts:
-            # Generate random coordinates
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            pos = (x, y)
-            
-            # Check if position is available (not wall, not start, not target)
-            if pos not in self.walls and pos != self.start and pos != self.target:
-                self.add_wall(x, y)
-                added += 1
-            
-            attempts += 1
-    
-    def spawn_dynamic_obstacle(self) -> Optional[Tuple[int, int]]:
+        # Draw directly from the free-cell pool: every draw succeeds, no rejection sampling.
+        # rng defaults to the module generator; pass a seeded Random to stay thread-safe
+        randrange = (rng or random).randrange
+        free_cells = self._free_cells
+        for _ in range(min(count, len(free_cells))):
+            index = free_cells[randrange(len(free_cells))]
+            y, x = divmod(index, self.width)
+            self.add_wall(x, y)
+    
+    def spawn_dynamic_obstacle(self, avoid: Optional[Tuple[int, int]] = None) -> Optional[Tuple[int, int]]:
   
         # Check if dynamic obstacle should spawn based on probability
         if random.random() > self.dynamic_spawn_probability:
             return None
         
-        # Collect all empty cells available for obstacle placement
-        empty_cells = []
-        for x in range(self.width):
-            for y in range(self.height):
-                pos = (x, y)
-                # Cell is empty if: not wall, not dynamic obstacle, not start, not target
-                if (pos not in self.walls and 
-                    pos not in self.dynamic_obstacles and 
-                    pos != self.start and 
-                    pos != self.target):
-                    empty_cells.append(pos)
-        
-        # Place obstacle at random empty location if available
-        if empty_cells:
-            new_obstacle = random.choice(empty_cells)
-            self.dynamic_obstacles.add(new_obstacle)
-            return new_obstacle
+        # A cell to keep free besides start and target (e.g. where a moving agent stands):
+        # its pool slot is skipped, so the draw stays uniform over the other free cells
+        skip = self._free_slot[self.index(avoid)] if avoid is not None else -1
+        count = len(self._free_cells) - (skip != -1)
         
         # No empty space available
-        return None
+        if not count:
+            return None
+        
+        # Place obstacle at a random empty location (never a wall, obstacle, start or target)
+        slot = random.randrange(count)
+        if skip != -1 and slot >= skip:
+            slot += 1
+        index = self._free_cells[slot]
+        new_obstacle = self.position(index)
+        self.dynamic_obstacles.add(new_obstacle)
+        self.occupancy[index] |= DYNAMIC_FLAG
+        self._take_free(index)
+        self._on_cell_blocked(*new_obstacle)
+        self._changed(index)
+        return new_obstacle
     
     def is_blocked(self, pos: Tuple[int, int]) -> bool:
    
@@ -123,39 +295,174 @@ class Grid:
         if not self._is_valid_position(pos):
             return True  # Out of bounds is always blocked
         # Check for static walls or dynamic obstacles
-        return pos in self.walls or pos in self.dynamic_obstacles
+        return self.occupancy[y * self.width + x] != FREE
+
+    def wall_mask(self, x0: int, y0: int, x1: int, y1: int) -> bytes:
+
+        # Static walls of the rectangle [x0, x1) x [y0, y1) as one 0/1 byte per cell,
+        # row by row; dynamic obstacles read as free
+        width, occupancy = self.width, self.occupancy
+        rows = b"".join(occupancy[y * width + x0:y * width + x1] for y in range(y0, y1))
+        return rows.translate(_WALL_MASK)
     
     def clear_dynamic_obstacles(self) -> None:
    
+        occupancy = self.occupancy
+        for pos in self.dynamic_obstacles:
+            index = self.index(pos)
+            occupancy[index] &= ~DYNAMIC_FLAG
+            if not occupancy[index]:
+                self._return_free(index)
+        if self.dynamic_obstacles:
+            # Freed cells can merge components, so every label is dropped
+            self._reset_components()
+            self._changed()
         self.dynamic_obstacles.clear()
     
+    def index(self, pos: Tuple[int, int]) -> int:
+
+        x, y = pos
+        # Flat cell id used by the occupancy array and the integer-node searches
+        return y * self.width + x
+    
+    def position(self, index: int) -> Tuple[int, int]:
+
+        y, x = divmod(index, self.width)
+        return (x, y)
+    
     def get_neighbors(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
 
         x, y = pos
+        occupancy = self.occupancy
+        base = y * self.width + x
+        
+        # Interior cells cannot step out of bounds, so only the occupancy byte is checked
+        if 0 < x < self.width - 1 and 0 < y < self.height - 1:
+            return [(x + dx, y + dy) for dx, dy, offset in self.neighbor_offsets
+                    if not occupancy[base + offset]]
+        
+        # Border cells additionally filter out positions outside the grid
+        neighbors = []
+        for dx, dy, offset in self.neighbor_offsets:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height and not occupancy[base + offset]:
+                neighbors.append((nx, ny))
+        
+        return neighbors
+    
+    def neighbor_ids(self, index: int) -> List[int]:
+
+        y, x = divmod(index, self.width)
+        occupancy = self.occupancy
+        
+        # Same ordering as get_neighbors, expressed as flat cell ids
+        if 0 < x < self.width - 1 and 0 < y < self.height - 1:
+            return [index + offset for _, _, offset in self.neighbor_offsets
+                    if not occupancy[index + offset]]
         
-        # Define all possible movements in the required order
-        # Each movement is defined as a displacement vector
-        movements = [
-            (x, y - 1),        # 1. Up
-            (x + 1, y),        # 2. Right
-            (x, y + 1),        # 3. Down
-            (x + 1, y + 1),    # 4. BottomRight Diagonal
-            (x - 1, y),        # 5. Left
-            (x - 1, y - 1),    # 6. TopLeft Diagonal
-            (x + 1, y - 1),    # 7. TopRight Diagonal
-            (x - 1, y + 1),    # 8. BottomLeft Diagonal
-        ]
-        
-        # Filter out invalid positions and blocked cells
         neighbors = []
-        for neighbor_pos in movements:
-            # Only add if within bounds AND not blocked by obstacle
-            if (self._is_valid_position(neighbor_pos) and 
-                not self.is_blocked(neighbor_pos)):
-                neighbors.append(neighbor_pos)
+        for dx, dy, offset in self.neighbor_offsets:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height and not occupancy[index + offset]:
+                neighbors.append(index + offset)
         
         return neighbors
     
+    def is_reachable(self, a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+
+        # Blocked or out-of-bounds endpoints can never be connected
+        if not self._is_valid_position(a) or not self._is_valid_position(b):
+            return False
+        if self.is_blocked(a) or self.is_blocked(b):
+            return False
+        if a == b or not self.track_components:
+            return True
+        return self._component_label(self.index(a)) == self._component_label(self.index(b))
+    
+    def any_reachable(self, sources, targets) -> bool:
+
+        # Multi-source / multi-target form of is_reachable: one label lookup per endpoint
+        sources = [pos for pos in sources if not self.is_blocked(pos)]
+        targets = [pos for pos in targets if not self.is_blocked(pos)]
+        if not sources or not targets:
+            return False
+        if not self.track_components:
+            return True
+        labels = {self._component_label(self.index(pos)) for pos in targets}
+        return any(self._component_label(self.index(pos)) in labels for pos in sources)
+    
+    def _component_label(self, index: int) -> int:
+
+        label = self.component[index]
+        if label == -1 or label in self._stale_labels:
+            label = self._flood_component(index)
+        return label
+    
+    def _flood_component(self, index: int) -> int:
+
+        # One-pass flood fill giving the whole component of `index` a fresh label
+        label = self._next_label
+        self._next_label += 1
+        component = self.component
+        neighbor_ids = self.neighbor_ids
+        component[index] = label
+        queue = deque([index])
+        while queue:
+            node = queue.popleft()
+            for neighbor in neighbor_ids(node):
+                if component[neighbor] != label:
+                    component[neighbor] = label
+                    queue.append(neighbor)
+        return label
+    
+    def _reset_components(self) -> None:
+
+        self.component = array('i', [-1]) * (self.width * self.height)
+        self._stale_labels.clear()
+    
+    def _on_cell_blocked(self, x: int, y: int) -> None:
+
+        if not self.track_components:
+            return
+        
+        # Free cells in the ring around the new obstacle, in circular order
+        occupancy = self.occupancy
+        ring = []
+        for dx, dy in RING:
+            nx, ny = x + dx, y + dy
+            ring.append(0 <= nx < self.width and 0 <= ny < self.height
+                        and not occupancy[ny * self.width + nx])
+        
+        label = -1
+        for (dx, dy), free in zip(RING, ring):
+            if free:
+                label = self.component[(y + dy) * self.width + x + dx]
+                break
+        if label == -1:
+            return  # Component not labeled yet (or no free neighbors), nothing to invalidate
+        
+        # Group the free ring cells by local adjacency: consecutive ring cells always touch,
+        # and edge cells two steps apart (N/E, E/S, ...) touch diagonally. If they form a
+        # single group the obstacle cannot split the component.
+        groups = list(range(8))
+        
+        def find(i):
+            while groups[i] != i:
+                groups[i] = groups[groups[i]]
+                i = groups[i]
+            return i
+        
+        for i in range(8):
+            if not ring[i]:
+                continue
+            for step in ((1, 2) if i % 2 == 0 else (1,)):
+                j = (i + step) % 8
+                if ring[j]:
+                    groups[find(i)] = find(j)
+        
+        if len({find(i) for i in range(8) if ring[i]}) > 1:
+            self._stale_labels.add(label)
+    
     def get_heuristic_distance(self, pos: Tuple[int, int]) -> float:
  
         x, y = pos
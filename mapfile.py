@@ -0,0 +1,420 @@
+"""
+Compact on-disk map format opened with mmap.
+
+Layout (little endian):
+    0   magic            8s   b"GRIDMAP1"
+    8   flags            I    bit 0: cost plane present
+    12  width, height    II
+    20  start, target    iiii (-1, -1 when not stored)
+    36  straight, diag   HH   move cost multipliers
+    40  max cost         B
+    64  occupancy plane       ceil(width * height / 8) bytes, one bit per cell,
+                              least significant bit first, 1 = wall
+    ..  cost plane            width * height bytes (1-255), 8-byte aligned, optional
+
+MappedGrid searches the file in place: walls are tested bit by bit and dynamic
+obstacles live in a small set, so a 20000x20000 map costs 50 MB of page cache
+instead of tens of GB of Python objects.
+
+Usage:
+    python mapfile.py --width 20000 --height 20000 --walls 0.2 huge.map
+"""
+import argparse
+import mmap
+import os
+import random
+import struct
+from collections import deque
+from typing import Iterator, List, Optional, Tuple
+
+from grid import CHANGE_LOG_SIZE, Grid, NEIGHBOR_MOVES, WALL_FLAG
+
+MAGIC = b"GRIDMAP1"
+HEADER = struct.Struct("<8sIIIiiiiHHB")
+HEADER_SIZE = 64
+HAS_COSTS = 1
+
+# Byte -> the 8 per-cell bytes it packs, and the reverse for 0/1 byte groups
+_UNPACK = [bytes((value >> bit) & 1 for bit in range(8)) for value in range(256)]
+_PACK = {cells: value for value, cells in enumerate(_UNPACK)}
+_WALL_MASK = bytes(flags & WALL_FLAG for flags in range(256))
+
+
+def _plane_offsets(width: int, height: int) -> Tuple[int, int, int]:
+
+    cells = width * height
+    bits_size = (cells + 7) // 8
+    cost_offset = HEADER_SIZE + ((bits_size + 7) & ~7)
+    return bits_size, cost_offset, cost_offset + cells
+
+
+def _write_header(handle, width: int, height: int, start, target, has_costs: bool,
+                  straight: int = 1, diagonal: int = 1, max_cost: int = 1) -> None:
+
+    start = start if start is not None else (-1, -1)
+    target = target if target is not None else (-1, -1)
+    header = HEADER.pack(MAGIC, HAS_COSTS if has_costs else 0, width, height,
+                         start[0], start[1], target[0], target[1], straight, diagonal, max_cost)
+    handle.write(header.ljust(HEADER_SIZE, b"\0"))
+
+
+def save_grid(grid: Grid, path: str, include_costs: Optional[bool] = None) -> None:
+    """
+    Convert an in-memory Grid to the mapped format.
+
+    Only static walls are written; dynamic obstacles are runtime state.
+
+    Args:
+        grid: Grid to convert
+        path: Output file
+        include_costs: Write the cost plane (defaults to only when the grid is weighted)
+    """
+    width, height = grid.width, grid.height
+    cells = width * height
+    if include_costs is None:
+        include_costs = not grid.is_uniform_cost()
+    bits_size, cost_offset, _ = _plane_offsets(width, height)
+
+    with open(path, "wb") as handle:
+        _write_header(handle, width, height, grid.start, grid.target, include_costs,
+                      grid.straight_cost, grid.diagonal_cost, max(grid.cost) if cells else 1)
+
+        # Pack in row-sized chunks so the converter never holds a second full copy
+        chunk = max(8, (width + 7) // 8 * 8) * 64
+        for begin in range(0, cells, chunk):
+            masked = bytes(grid.occupancy[begin:begin + chunk].translate(_WALL_MASK))
+            masked += bytes(-len(masked) % 8)
+            handle.write(bytes(_PACK[masked[i:i + 8]] for i in range(0, len(masked), 8)))
+
+        if include_costs:
+            handle.write(bytes(cost_offset - HEADER_SIZE - bits_size))
+            handle.write(grid.cost)
+
+
+def create_map(path: str, width: int, height: int, with_costs: bool = False,
+               start=None, target=None) -> None:
+
+    # Empty map written sparsely, for maps too large to build as an in-memory Grid first
+    bits_size, cost_offset, end = _plane_offsets(width, height)
+    with open(path, "wb") as handle:
+        _write_header(handle, width, height, start, target, with_costs)
+        if with_costs:
+            handle.seek(cost_offset)
+            step = 1 << 20
+            ones = b"\x01" * step
+            for begin in range(0, width * height, step):
+                handle.write(ones[:min(step, width * height - begin)])
+        else:
+            handle.truncate(HEADER_SIZE + bits_size)
+
+
+def load_grid(path: str, start=None, target=None) -> Grid:
+
+    # Copy a mapped file back into a regular Grid (small maps only)
+    mapped = MappedGrid.open(path, start, target)
+    try:
+        grid = Grid.from_occupancy(mapped.width, mapped.height, mapped.start, mapped.target,
+                                   mapped.occupancy, 0.0,
+                                   bytes(mapped.cost) if mapped.has_costs else None)
+        grid.set_move_costs(mapped.straight_cost, mapped.diagonal_cost)
+        return grid
+    finally:
+        mapped.close()
+
+
+class WallView:
+
+    # Read-only stand-in for Grid.walls backed by the bit plane
+    def __init__(self, grid: "MappedGrid"):
+        self.grid = grid
+        self._count: Optional[int] = None
+
+    def __contains__(self, pos) -> bool:
+        x, y = pos
+        grid = self.grid
+        if not (0 <= x < grid.width and 0 <= y < grid.height):
+            return False
+        index = y * grid.width + x
+        return bool((grid.bits[index >> 3] >> (index & 7)) & 1)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        grid = self.grid
+        width, cells = grid.width, grid.width * grid.height
+        for byte_index, value in enumerate(grid.bits):
+            if value:
+                base = byte_index << 3
+                for bit in range(8):
+                    if (value >> bit) & 1 and base + bit < cells:
+                        y, x = divmod(base + bit, width)
+                        yield (x, y)
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self._count = sum(bin(value).count("1") for value in self.grid.bits)
+        return self._count
+
+
+class MappedGrid(Grid):
+    """
+    Grid backed by a memory-mapped map file.
+
+    Searches use get_neighbors / neighbor_ids / is_blocked, which read wall bits
+    straight from the mapping. Connected-component tracking and the free-cell pool
+    are per-cell Python-side tables, so they are disabled: is_reachable only checks
+    the endpoints and dynamic obstacles are placed by rejection sampling.
+    """
+
+    def __init__(self, path: str, start: Optional[Tuple[int, int]] = None,
+                 target: Optional[Tuple[int, int]] = None, writable: bool = False,
+                 dynamic_spawn_probability: float = 0.02):
+
+        self.path = path
+        self.writable = writable
+        self._file = open(path, "r+b" if writable else "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0,
+                              access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+
+        (magic, flags, width, height, sx, sy, tx, ty,
+         straight, diagonal, max_cost) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a grid map file")
+
+        bits_size, cost_offset, end = _plane_offsets(width, height)
+        self.has_costs = bool(flags & HAS_COSTS)
+        view = memoryview(self._map)
+        self.bits = view[HEADER_SIZE:HEADER_SIZE + bits_size]
+        self.cost = view[cost_offset:end] if self.has_costs else _UniformCost()
+        self._max_cost = max_cost
+
+        self.width = width
+        self.height = height
+        self.start = start if start is not None else (sx, sy)
+        self.target = target if target is not None else (tx, ty)
+        self.straight_cost = straight
+        self.diagonal_cost = diagonal
+        self.walls = WallView(self)
+        self.dynamic_obstacles = set()
+        self.dynamic_spawn_probability = dynamic_spawn_probability
+        self._dynamic = set()
+        self.neighbor_offsets = tuple((dx, dy, dy * width + dx) for dx, dy in NEIGHBOR_MOVES)
+        self.track_components = False
+        self.version = 0
+        self._blocked_log = deque(maxlen=CHANGE_LOG_SIZE)
+        self._unlisted_version = 0
+
+        for label, pos in (("Start", self.start), ("Target", self.target)):
+            if not self._is_valid_position(pos):
+                self.close()
+                raise ValueError(f"{label} position {pos} is out of grid bounds ({width}×{height})")
+
+    @classmethod
+    def open(cls, path: str, start=None, target=None, writable: bool = False) -> "MappedGrid":
+        return cls(path, start, target, writable)
+
+    def close(self) -> None:
+
+        # Views into the mapping must be released before it can be closed
+        for name in ("bits", "cost"):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        if getattr(self, "_file", None) is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "MappedGrid":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def occupancy(self) -> bytearray:
+
+        # Unpacked one-byte-per-cell copy for array-level consumers (WavefrontBFS,
+        # landmark tables); costs width * height bytes, so searches avoid it
+        cells = self.width * self.height
+        occupancy = bytearray(b"".join(map(_UNPACK.__getitem__, self.bits))[:cells])
+        for index in self._dynamic:
+            occupancy[index] |= 2
+        return occupancy
+
+    def _is_wall(self, index: int) -> bool:
+        return bool((self.bits[index >> 3] >> (index & 7)) & 1)
+
+    def wall_mask(self, x0: int, y0: int, x1: int, y1: int) -> bytes:
+
+        # Unpacks only the plane bytes covering each row of the rectangle
+        width, bits = self.width, self.bits
+        rows = []
+        for y in range(y0, y1):
+            start = y * width + x0
+            unpacked = b"".join(map(_UNPACK.__getitem__, bits[start >> 3:(y * width + x1 + 7) >> 3]))
+            offset = start & 7
+            rows.append(unpacked[offset:offset + x1 - x0])
+        return b"".join(rows)
+
+    def add_wall(self, x: int, y: int) -> None:
+
+        pos = (x, y)
+        if self._is_valid_position(pos) and pos != self.start and pos != self.target:
+            if not self.writable:
+                raise ValueError(f"{self.path} was opened read-only")
+            index = y * self.width + x
+            if self._is_wall(index):
+                return
+            self.bits[index >> 3] |= 1 << (index & 7)
+            self.walls._count = None
+            if index not in self._dynamic:
+                self._changed(index)
+
+    def add_walls_randomly(self, count: int, rng: Optional[random.Random] = None) -> None:
+
+        # No free-cell pool here: sample cells and skip blocked ones until count walls are
+        # placed (or every free cell is a wall), the same number Grid places. Once fewer
+        # than 1/8 of the cells are free, the rest come from a scan of the plane.
+        rng = rng or random
+        width, cells = self.width, self.width * self.height
+        taken = {self.index(self.start), self.index(self.target)} | self._dynamic
+        free = cells - len(self.walls) - sum(1 for index in taken if not self._is_wall(index))
+        remaining = min(count, free)
+        while remaining and free * 8 >= cells:
+            index = rng.randrange(cells)
+            if index not in taken and not self._is_wall(index):
+                self.add_wall(index % width, index // width)
+                free -= 1
+                remaining -= 1
+        if remaining:
+            candidates = [index for index in self._free_indices() if index not in taken]
+            for index in rng.sample(candidates, remaining):
+                self.add_wall(index % width, index // width)
+
+    def _free_indices(self) -> Iterator[int]:
+
+        # Cells whose wall bit is clear, skipping fully walled bytes of the plane
+        cells = self.width * self.height
+        for byte_index, value in enumerate(self.bits):
+            if value != 0xFF:
+                base = byte_index << 3
+                for bit in range(8):
+                    if not (value >> bit) & 1 and base + bit < cells:
+                        yield base + bit
+
+    def set_cost(self, x: int, y: int, cost: int) -> None:
+
+        if not self.has_costs:
+            raise ValueError(f"{self.path} has no cost plane")
+        if not self.writable:
+            raise ValueError(f"{self.path} was opened read-only")
+        if not 1 <= cost <= 255:
+            raise ValueError(f"Terrain cost must be between 1 and 255, got {cost}")
+        index = y * self.width + x
+        if self.cost[index] == cost:
+            return
+        self.cost[index] = cost
+        self._changed()
+        if cost > self._max_cost:
+            self._max_cost = cost
+            struct.pack_into("<B", self._map, 40, cost)
+
+    def is_uniform_cost(self) -> bool:
+        return not self.has_costs and self.straight_cost == self.diagonal_cost == 1
+
+    def max_step_cost(self) -> int:
+        return self._max_cost * max(self.straight_cost, self.diagonal_cost)
+
+    def spawn_dynamic_obstacle(self, avoid: Optional[Tuple[int, int]] = None) -> Optional[Tuple[int, int]]:
+
+        if random.random() > self.dynamic_spawn_probability:
+            return None
+
+        # No free-cell pool here: sample until a free cell turns up (bounded attempts)
+        cells = self.width * self.height
+        for _ in range(64):
+            index = random.randrange(cells)
+            pos = self.position(index)
+            if pos != self.start and pos != self.target and pos != avoid \
+                    and not self._is_wall(index) and index not in self._dynamic:
+                self._dynamic.add(index)
+                self.dynamic_obstacles.add(pos)
+                self._changed(index)
+                return pos
+        return None
+
+    def is_blocked(self, pos: Tuple[int, int]) -> bool:
+
+        if not self._is_valid_position(pos):
+            return True
+        index = pos[1] * self.width + pos[0]
+        return self._is_wall(index) or index in self._dynamic
+
+    def clear_dynamic_obstacles(self) -> None:
+
+        if self._dynamic:
+            self._changed()
+        self._dynamic.clear()
+        self.dynamic_obstacles.clear()
+
+    def get_neighbors(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+
+        x, y = pos
+        base = y * self.width + x
+        return [self.position(index) for index in self._open_neighbors(base, x, y)]
+
+    def neighbor_ids(self, index: int) -> List[int]:
+
+        y, x = divmod(index, self.width)
+        return self._open_neighbors(index, x, y)
+
+    def _open_neighbors(self, base: int, x: int, y: int) -> List[int]:
+
+        bits, dynamic = self.bits, self._dynamic
+        neighbors = []
+        if 0 < x < self.width - 1 and 0 < y < self.height - 1:
+            for _, _, offset in self.neighbor_offsets:
+                index = base + offset
+                if not (bits[index >> 3] >> (index & 7)) & 1 and index not in dynamic:
+                    neighbors.append(index)
+            return neighbors
+
+        for dx, dy, offset in self.neighbor_offsets:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                index = base + offset
+                if not (bits[index >> 3] >> (index & 7)) & 1 and index not in dynamic:
+                    neighbors.append(index)
+        return neighbors
+
+
+class _UniformCost:
+
+    # Cost plane stand-in for maps stored without one
+    def __getitem__(self, index: int) -> int:
+        return 1
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Create a random map file without building it in memory.")
+    parser.add_argument("path")
+    parser.add_argument("--width", type=int, required=True)
+    parser.add_argument("--height", type=int, required=True)
+    parser.add_argument("--walls", type=float, default=0.2, help="Fraction of cells turned into walls")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    start, target = (0, 0), (args.width - 1, args.height - 1)
+    create_map(args.path, args.width, args.height, start=start, target=target)
+    with MappedGrid.open(args.path, writable=True) as grid:
+        grid.add_walls_randomly(int(args.width * args.height * args.walls))
+        print(f"✓ Wrote {args.path}: {args.width}×{args.height}, {len(grid.walls)} walls, "
+              f"{os.path.getsize(args.path)} bytes")
+
+
+if __name__ == "__main__":
+    main()
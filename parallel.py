@@ -0,0 +1,296 @@
+"""
+Process-pool runner for algorithm comparisons and scenario sweeps.
+
+Each grid is copied once into a shared memory block. Worker processes attach to
+it by name and rebuild their own Grid the first time they see it, so jobs only
+pickle a small descriptor instead of the full grid.
+
+Usage:
+    python parallel.py --scenarios 1000 --json sweep.json
+"""
+import argparse
+import json
+import os
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from grid import Grid
+
+
+class Scenario(NamedTuple):
+
+    width: int
+    height: int
+    start: Tuple[int, int]
+    target: Tuple[int, int]
+    num_walls: int
+    seed: int
+
+
+class SharedGridSpec(NamedTuple):
+
+    name: str                       # Shared memory block holding the occupancy bytes
+    width: int
+    height: int
+    start: Tuple[int, int]
+    target: Tuple[int, int]
+    dynamic_spawn_probability: float
+    weighted: bool = False          # Cost plane stored right after the occupancy bytes
+    straight_cost: int = 1
+    diagonal_cost: int = 1
+
+
+def build_grid(scenario: Scenario) -> Grid:
+
+    # Seeded so every algorithm in a sweep sees exactly the same walls. A generator of its
+    # own keeps grids built on several threads at once (server loads) independent
+    grid = Grid(scenario.width, scenario.height, scenario.start, scenario.target, 0.0)
+    grid.add_walls_randomly(scenario.num_walls, random.Random(scenario.seed))
+    return grid
+
+
+# Grids each worker process keeps rebuilt at once; the least recently used goes first
+WORKER_GRID_LIMIT = 8
+
+# Grids shared at a time by run_jobs; their blocks are released before the next batch
+BATCH_SIZE = 64
+
+
+class SharedGridPool:
+
+    def __init__(self):
+        self.blocks: List[shared_memory.SharedMemory] = []
+        # References per block name: one for the owner plus one per job not yet finished
+        self.references: Dict[str, int] = {}
+
+    def share(self, grid: Grid) -> SharedGridSpec:
+
+        # Unit-cost grids only share occupancy; weighted ones append their cost plane
+        size = len(grid.occupancy)
+        weighted = not grid.is_uniform_cost()
+        block = shared_memory.SharedMemory(create=True, size=max(1, size * (2 if weighted else 1)))
+        block.buf[:size] = grid.occupancy
+        if weighted:
+            block.buf[size:2 * size] = grid.cost
+        self.blocks.append(block)
+        self.references[block.name] = 1
+        return SharedGridSpec(block.name, grid.width, grid.height, grid.start, grid.target,
+                              grid.dynamic_spawn_probability, weighted,
+                              grid.straight_cost, grid.diagonal_cost)
+
+    def acquire(self, spec: SharedGridSpec) -> None:
+
+        # Taken for each submitted job, so the block outlives the jobs that may attach to it
+        self.references[spec.name] += 1
+
+    def release(self, spec: SharedGridSpec) -> None:
+
+        # Drops one reference (the owner's or a finished job's); the block is unlinked with
+        # the last one. Workers that already attached keep their own copy.
+        count = self.references.get(spec.name)
+        if count is None:
+            return
+        if count > 1:
+            self.references[spec.name] = count - 1
+            return
+        del self.references[spec.name]
+        for block in self.blocks:
+            if block.name == spec.name:
+                self.blocks.remove(block)
+                block.close()
+                block.unlink()
+                return
+
+    def close(self) -> None:
+
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+        self.references.clear()
+
+    def __enter__(self) -> "SharedGridPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# Grids already rebuilt in this worker process, keyed by shared memory name and bounded
+# so replaced or unloaded grids eventually drop out
+_worker_grids: "OrderedDict[str, Grid]" = OrderedDict()
+
+
+def attach_grid(spec: SharedGridSpec) -> Grid:
+
+    grid = _worker_grids.get(spec.name)
+    if grid is not None:
+        _worker_grids.move_to_end(spec.name)
+    else:
+        size = spec.width * spec.height
+        block = shared_memory.SharedMemory(name=spec.name)
+        try:
+            occupancy = bytes(block.buf[:size])
+            costs = bytes(block.buf[size:2 * size]) if spec.weighted else None
+        finally:
+            block.close()
+        grid = Grid.from_occupancy(spec.width, spec.height, spec.start, spec.target,
+                                   occupancy, spec.dynamic_spawn_probability, costs)
+        grid.set_move_costs(spec.straight_cost, spec.diagonal_cost)
+        _worker_grids[spec.name] = grid
+        if len(_worker_grids) > WORKER_GRID_LIMIT:
+            _worker_grids.popitem(last=False)
+    return grid
+
+
+def _run_job(job: Tuple[int, SharedGridSpec, str, type, int]) -> dict:
+
+    scenario_index, spec, algorithm_name, algorithm_class, seed = job
+    grid = attach_grid(spec)
+    grid.clear_dynamic_obstacles()
+    random.seed(seed)
+
+    started = time.perf_counter()
+    result = algorithm_class(grid).search()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "scenario": scenario_index,
+        "seed": seed,
+        "width": spec.width,
+        "height": spec.height,
+        "algorithm": algorithm_name,
+        "found": result.found,
+        "path_length": result.path_length,
+        "nodes_explored": result.total_nodes_explored,
+        "seconds": elapsed,
+    }
+
+
+def run_jobs(grids: Iterable[Tuple[Grid, int]], algorithms: Dict[str, type],
+             max_workers: Optional[int] = None, batch_size: int = BATCH_SIZE) -> List[dict]:
+    """
+    Run every algorithm on every grid in a process pool.
+
+    Grids are taken batch_size at a time, so only one batch is built and held in
+    shared memory at once; pass a generator to keep large sweeps lazy.
+
+    Args:
+        grids: (grid, seed) pairs; the seed is applied before each search
+        algorithms: Mapping of algorithm name to search class
+        max_workers: Pool size (defaults to the number of CPUs)
+        batch_size: Grids shared per batch
+
+    Returns:
+        One record per (grid, algorithm) job, ordered by grid then algorithm
+    """
+    workers = max_workers or os.cpu_count() or 1
+    grids = iter(grids)
+    records: List[dict] = []
+    scenario_index = 0
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            batch = list(islice(grids, batch_size))
+            if not batch:
+                return records
+            with SharedGridPool() as pool:
+                jobs = []
+                for grid, seed in batch:
+                    spec = pool.share(grid)
+                    for algorithm_name, algorithm_class in algorithms.items():
+                        jobs.append((scenario_index, spec, algorithm_name, algorithm_class, seed))
+                    scenario_index += 1
+                # The grids now live in shared memory; drop the Python copies while it runs
+                del batch
+
+                chunksize = max(1, len(jobs) // (workers * 16))
+                records.extend(executor.map(_run_job, jobs, chunksize=chunksize))
+
+
+def summarize(records: List[dict]) -> Dict[str, dict]:
+
+    # Collapse records into the shape expected by print_comparison_table:
+    # found only if found in every scenario, averages for path length and nodes explored
+    summary: Dict[str, dict] = {}
+    for algorithm_name in dict.fromkeys(record["algorithm"] for record in records):
+        runs = [record for record in records if record["algorithm"] == algorithm_name]
+        found_runs = [record for record in runs if record["found"]]
+        summary[algorithm_name] = {
+            "found": len(found_runs) == len(runs),
+            "path_length": round(sum(r["path_length"] for r in found_runs) / len(found_runs))
+                           if found_runs else 0,
+            "nodes_explored": round(sum(r["nodes_explored"] for r in runs) / len(runs)),
+        }
+    return summary
+
+
+def print_comparison_table(results: Dict[str, dict]) -> None:
+
+    print(f"\n{'='*80}")
+    print("COMPARISON OF ALL ALGORITHMS")
+    print(f"{'='*80}")
+    
+    # Print header
+    print(f"{'Algorithm':<20} {'Found':<8} {'Path Length':<15} {'Nodes Explored':<15}")
+    print(f"{'-'*80}")
+    
+    # Print each result
+    for algo_name, metrics in results.items():
+        found_str = "Yes" if metrics["found"] else "No"
+        path_len = metrics["path_length"] if metrics["path_length"] > 0 else "N/A"
+        
+        print(f"{algo_name:<20} {found_str:<8} {str(path_len):<15} {metrics['nodes_explored']:<15}")
+    
+    print(f"{'='*80}\n")
+
+
+def run_sweep(scenarios: List[Scenario], algorithms: Dict[str, type],
+              max_workers: Optional[int] = None, json_path: Optional[str] = None) -> List[dict]:
+    """
+    Build each scenario's grid once, run all algorithms on it in parallel and
+    optionally write the raw records as JSON.
+    """
+    # Built lazily: run_jobs pulls one batch of grids at a time
+    grids = ((build_grid(scenario), scenario.seed) for scenario in scenarios)
+    records = run_jobs(grids, algorithms, max_workers)
+
+    if json_path:
+        with open(json_path, "w") as handle:
+            json.dump(records, handle, indent=2)
+
+    return records
+
+
+def main() -> None:
+
+    from algorithms_used import ALGORITHMS
+
+    parser = argparse.ArgumentParser(description="Run an algorithm sweep over seeded random grids.")
+    parser.add_argument("--scenarios", type=int, default=100)
+    parser.add_argument("--width", type=int, default=50)
+    parser.add_argument("--height", type=int, default=50)
+    parser.add_argument("--walls", type=int, default=250)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--algorithms", nargs="+", default=["BFS", "DFS", "UCS", "DLS", "IDDFS", "BIDIRECTIONAL"])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", default=None, help="Write raw records to this file")
+    args = parser.parse_args()
+
+    scenarios = [
+        Scenario(args.width, args.height, (5, 5), (args.width - 6, args.height - 6), args.walls, seed)
+        for seed in range(args.first_seed, args.first_seed + args.scenarios)
+    ]
+
+    algorithms = {name: ALGORITHMS[name] for name in args.algorithms}
+    records = run_sweep(scenarios, algorithms, args.workers, args.json_path)
+    print_comparison_table(summarize(records))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Bounded cache of search results, keyed on the grid version.
+
+A result is stored under (algorithm, start, target) together with the grid's
+version at search time. Grid.version moves on every wall, obstacle or cost change,
+so a plain lookup only returns results computed on the current layout. Entries
+are evicted least recently used first, once either the entry count or the
+estimated byte size of the stored results goes over its limit.
+
+With revalidate=True, a result older than the current version is still served
+when the only changes since were newly blocked cells and none of them lies on its
+path. Removing cells never shortens a path, so a shortest path stays shortest;
+the explored set and frontier history then describe the earlier layout.
+
+Usage:
+    cache = PathCache(max_entries=64, max_bytes=32 * 1024 * 1024)
+    result = cache.get(grid, "BFS")
+    if result is None:
+        result = cache.put(grid, "BFS", BFS(grid).search(), version)
+    print(cache.stats())
+"""
+import sys
+import weakref
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+from grid import Grid
+
+# Rough per-item costs for estimate_bytes: a path cell is a list slot plus an (x, y)
+# tuple, an explored cell a set slot plus the tuple, a history event a kind byte plus
+# a list slot (its node tuple is usually shared with explored)
+PATH_CELL_BYTES = 72
+EXPLORED_CELL_BYTES = 80
+HISTORY_EVENT_BYTES = 9
+
+
+class _Entry(NamedTuple):
+
+    grid: weakref.ref
+    version: int
+    result: object
+    nbytes: int
+
+
+def estimate_bytes(result) -> int:
+    """
+    Approximate memory held by a SearchResult, without building lazy paths or sets.
+
+    Deferred results (compact and NumPy searches) also count the width * height
+    arrays of the search they keep alive until their path and explored set exist.
+
+    Args:
+        result: SearchResult to measure
+    """
+    size = sys.getsizeof(result) + result.source_bytes()
+    size += result.path_length * PATH_CELL_BYTES
+    size += result.total_nodes_explored * EXPLORED_CELL_BYTES
+
+    history = result.history
+    if hasattr(history, "kinds"):
+        size += len(history.kinds) * HISTORY_EVENT_BYTES
+    elif hasattr(history, "samples"):
+        size += sum(len(sample) for sample in history.samples) * PATH_CELL_BYTES
+    elif isinstance(history, list):
+        size += sum(len(frontier) for frontier in history) * PATH_CELL_BYTES
+    return size
+
+
+class PathCache:
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024,
+                 revalidate: bool = True):
+        """
+        Args:
+            max_entries: Most results kept at once
+            max_bytes: Upper bound on the summed estimate_bytes of kept results
+            revalidate: Serve older results whose path no newly blocked cell touches
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.revalidate = revalidate
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, grid: Grid, algorithm_name: str,
+            start: Optional[Tuple[int, int]] = None,
+            target: Optional[Tuple[int, int]] = None):
+        """
+        Cached result for this query on the grid as it is now, or None.
+
+        Args:
+            grid: Grid the query runs on
+            algorithm_name: Registry name of the search
+            start: Start position (defaults to grid.start)
+            target: Target position (defaults to grid.target)
+        """
+        key = (algorithm_name, start or grid.start, target or grid.target)
+        entry = self._entries.get(key)
+        if entry is None or entry.grid() is not grid:
+            self.misses += 1
+            return None
+
+        if entry.version != grid.version:
+            if not self._still_valid(grid, entry):
+                self._drop(key)
+                self.misses += 1
+                return None
+            # Re-stamp so the next lookup doesn't check the same changes again
+            entry = entry._replace(version=grid.version)
+            self._entries[key] = entry
+            self.revalidated += 1
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.result
+
+    def put(self, grid: Grid, algorithm_name: str, result, version: int,
+            start: Optional[Tuple[int, int]] = None,
+            target: Optional[Tuple[int, int]] = None):
+        """
+        Store a result and return it.
+
+        Args:
+            grid: Grid the search ran on
+            algorithm_name: Registry name of the search
+            result: SearchResult to keep
+            version: grid.version read before the search started; if the search itself
+                changed the grid (dynamic obstacles) the result is not stored
+            start: Start position (defaults to grid.start)
+            target: Target position (defaults to grid.target)
+        """
+        if version != grid.version:
+            return result
+        key = (algorithm_name, start or grid.start, target or grid.target)
+        if key in self._entries:
+            self._drop(key)
+
+        nbytes = estimate_bytes(result)
+        if nbytes > self.max_bytes:
+            return result
+        self._entries[key] = _Entry(weakref.ref(grid), version, result, nbytes)
+        self.nbytes += nbytes
+
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+        return result
+
+    def _still_valid(self, grid: Grid, entry: _Entry) -> bool:
+
+        result = entry.result
+        if not self.revalidate or not result.found:
+            return False
+        blocked = grid.blocked_since(entry.version)
+        if blocked is None:
+            return False
+        if not blocked:
+            return True
+        index = grid.index
+        return not any(index(pos) in blocked for pos in result.path)
+
+    def _drop(self, key: tuple) -> None:
+
+        entry = self._entries.pop(key)
+        self.nbytes -= entry.nbytes
+
+    def clear(self) -> None:
+
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict:
+
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,368 @@
+"""
+Asyncio path-query server over a local Unix or TCP socket.
+
+Grids are loaded once and copied into shared memory; a process pool runs the
+searches, so the event loop only parses requests and writes responses. Identical
+queries that arrive while the same search is still running share its answer.
+Nothing is printed per request.
+
+Protocol: one JSON object per line in each direction. A request's "id" is echoed
+in its response; responses on one connection may arrive out of order.
+
+    {"id": 1, "op": "load", "grid": "city", "path": "maps/city.gmap"}
+    {"id": 2, "op": "load", "grid": "demo", "width": 200, "height": 200, "walls": 8000, "seed": 3}
+    {"id": 3, "op": "query", "grid": "city", "algorithm": "BFS", "start": [0, 0], "target": [9, 9]}
+    {"id": 4, "op": "grids"}
+    {"id": 5, "op": "stats"}
+    {"id": 6, "op": "unload", "grid": "demo"}
+
+The "stats" response counts requests, searches and coalesced queries and gives
+query latency percentiles over the last LATENCY_WINDOW queries.
+
+Query responses hold found, path (left out with "path": false), path_length,
+nodes_explored, search_ms (time spent in the worker), coalesced (true when the
+answer came from another request's search) and latency_ms (from receiving the
+line to writing the response). Failed requests get an "error" message instead.
+
+Usage:
+    python server.py --unix /tmp/pathfinder.sock --map city=maps/city.gmap
+    python server.py --port 8765 --workers 4
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from algorithms_used.history import NullRecorder
+from grid import Grid
+from mapfile import load_grid
+from parallel import Scenario, SharedGridPool, SharedGridSpec, attach_grid, build_grid
+
+# Latencies kept for the percentiles reported by the "stats" op
+LATENCY_WINDOW = 10000
+
+# Per worker process: whether an algorithm class accepts a recorder, so history
+# recording can be switched off for every search that supports it
+_takes_recorder: Dict[type, bool] = {}
+
+
+def _run_query(spec: SharedGridSpec, algorithm_class: type, start: Tuple[int, int],
+               target: Tuple[int, int], with_path: bool) -> dict:
+
+    takes_recorder = _takes_recorder.get(algorithm_class)
+    if takes_recorder is None:
+        takes_recorder = "recorder" in inspect.signature(algorithm_class).parameters
+        _takes_recorder[algorithm_class] = takes_recorder
+
+    # The rebuilt grid is shared by every query on it in this worker: the endpoints are
+    # only borrowed for this search, so defaults stay those of the loaded grid
+    grid = attach_grid(spec)
+    grid.clear_dynamic_obstacles()
+    grid.start, grid.target = start, target
+    try:
+        started = time.perf_counter()
+        if takes_recorder:
+            result = algorithm_class(grid, recorder=NullRecorder()).search()
+        else:
+            result = algorithm_class(grid).search()
+        elapsed = time.perf_counter() - started
+
+        record = {
+            "found": result.found,
+            "path_length": result.path_length,
+            "nodes_explored": result.total_nodes_explored,
+            "search_ms": elapsed * 1000,
+        }
+        if with_path:
+            record["path"] = [list(pos) for pos in result.path]
+    finally:
+        grid.start, grid.target = spec.start, spec.target
+    return record
+
+
+def _field(request: dict, name: str):
+
+    if name not in request:
+        raise ValueError(f"Missing field '{name}'")
+    return request[name]
+
+
+def _position(request: dict, name: str, default: Tuple[int, int], grid: Grid) -> Tuple[int, int]:
+
+    value = request.get(name)
+    if value is None:
+        return default
+    try:
+        x, y = (int(coordinate) for coordinate in value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be an [x, y] pair, got {value!r}")
+    if not (0 <= x < grid.width and 0 <= y < grid.height):
+        raise ValueError(f"'{name}' {(x, y)} is out of grid bounds ({grid.width}×{grid.height})")
+    return (x, y)
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class QueryServer:
+
+    def __init__(self, algorithms: Dict[str, type], max_workers: Optional[int] = None):
+        """
+        Args:
+            algorithms: Mapping of algorithm name to search class (e.g. ALGORITHMS)
+            max_workers: Worker processes for searches (defaults to the number of CPUs)
+        """
+        self.algorithms = algorithms
+        self.pool = SharedGridPool()
+        self.grids: Dict[str, Tuple[Grid, SharedGridSpec]] = {}
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        # Searches still running, keyed by everything that decides their answer
+        self.in_flight: Dict[tuple, asyncio.Future] = {}
+        self.latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self.counters = {"requests": 0, "queries": 0, "searches": 0, "coalesced": 0, "errors": 0}
+
+    def add_grid(self, name: str, grid: Grid) -> SharedGridSpec:
+
+        # Replacing a grid drops the server's reference to the old block; it is unlinked
+        # once the searches still queued on it have finished
+        previous = self.grids.pop(name, None)
+        if previous is not None:
+            self.pool.release(previous[1])
+        spec = self.pool.share(grid)
+        self.grids[name] = (grid, spec)
+        return spec
+
+    def remove_grid(self, name: str) -> None:
+
+        _, spec = self.grids.pop(name)
+        self.pool.release(spec)
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+
+        # Every line becomes its own task, so a slow search never holds up later requests
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self.respond(line, time.perf_counter(), writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except (ConnectionError, asyncio.CancelledError):
+            # Client went away, or the server is shutting down
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    async def respond(self, line: bytes, received: float, writer: asyncio.StreamWriter) -> None:
+
+        self.counters["requests"] += 1
+        request_id = None
+        is_query = False
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            request_id = request.get("id")
+            is_query = request.get("op", "query") == "query"
+            response = await self.dispatch(request)
+        except ValueError as error:
+            self.counters["errors"] += 1
+            response = {"error": str(error)}
+        except Exception as error:
+            # A failing search (or worker) answers this request only; the server keeps going
+            self.counters["errors"] += 1
+            response = {"error": f"{type(error).__name__}: {error}"}
+
+        if request_id is not None:
+            response["id"] = request_id
+        latency = (time.perf_counter() - received) * 1000
+        response["latency_ms"] = round(latency, 3)
+        if is_query and "error" not in response:
+            self.latencies.append(latency)
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    async def dispatch(self, request: dict) -> dict:
+
+        op = request.get("op", "query")
+        if op == "query":
+            return await self.query(request)
+        if op == "load":
+            return await self.load(request)
+        if op == "unload":
+            name = _field(request, "grid")
+            if name not in self.grids:
+                raise ValueError(f"Unknown grid '{name}'")
+            self.remove_grid(name)
+            return {"unloaded": name}
+        if op == "grids":
+            return {"grids": {name: {"width": grid.width, "height": grid.height,
+                                     "start": list(grid.start), "target": list(grid.target),
+                                     "weighted": not grid.is_uniform_cost()}
+                              for name, (grid, _) in self.grids.items()}}
+        if op == "stats":
+            return self.stats()
+        raise ValueError(f"Unknown op '{op}'")
+
+    async def query(self, request: dict) -> dict:
+
+        name = _field(request, "grid")
+        if name not in self.grids:
+            raise ValueError(f"Unknown grid '{name}'")
+        algorithm_name = request.get("algorithm", "BFS")
+        algorithm_class = self.algorithms.get(algorithm_name)
+        if algorithm_class is None:
+            raise ValueError(f"Unknown algorithm '{algorithm_name}'")
+        grid, spec = self.grids[name]
+        start = _position(request, "start", grid.start, grid)
+        target = _position(request, "target", grid.target, grid)
+        with_path = bool(request.get("path", True))
+
+        self.counters["queries"] += 1
+        key = (spec.name, algorithm_name, start, target, with_path)
+        future = self.in_flight.get(key)
+        coalesced = future is not None
+        if coalesced:
+            self.counters["coalesced"] += 1
+        else:
+            self.counters["searches"] += 1
+            loop = asyncio.get_running_loop()
+            self.pool.acquire(spec)
+            future = loop.run_in_executor(self.executor, _run_query, spec, algorithm_class,
+                                          start, target, with_path)
+            self.in_flight[key] = future
+
+            def finished(done: asyncio.Future) -> None:
+                if self.in_flight.get(key) is done:
+                    del self.in_flight[key]
+                self.pool.release(spec)
+
+            future.add_done_callback(finished)
+
+        # Shielded: a client that disconnects must not cancel a search others wait on
+        record = await asyncio.shield(future)
+        response = dict(record)
+        response["search_ms"] = round(response["search_ms"], 3)
+        response["coalesced"] = coalesced
+        return response
+
+    async def load(self, request: dict) -> dict:
+
+        name = _field(request, "grid")
+        if "path" in request:
+            def build() -> Grid:
+                return load_grid(request["path"])
+        else:
+            width = int(_field(request, "width"))
+            height = int(_field(request, "height"))
+            start = tuple(request.get("start", (0, 0)))
+            target = tuple(request.get("target", (width - 1, height - 1)))
+            scenario = Scenario(width, height, start, target, int(request.get("walls", 0)),
+                                int(request.get("seed", 0)))
+
+            def build() -> Grid:
+                return build_grid(scenario)
+
+        # Building a large grid takes a while; keep the loop answering other requests
+        grid = await asyncio.get_running_loop().run_in_executor(None, build)
+        self.add_grid(name, grid)
+        return {"loaded": name, "width": grid.width, "height": grid.height}
+
+    def stats(self) -> dict:
+
+        stats = dict(self.counters)
+        stats["in_flight"] = len(self.in_flight)
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            stats["query_latency_ms"] = {
+                "mean": round(sum(ordered) / len(ordered), 3),
+                "p50": round(_percentile(ordered, 0.50), 3),
+                "p95": round(_percentile(ordered, 0.95), 3),
+                "p99": round(_percentile(ordered, 0.99), 3),
+                "max": round(ordered[-1], 3),
+            }
+        return stats
+
+    def close(self) -> None:
+
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.pool.close()
+
+
+async def serve(server: QueryServer, unix_path: Optional[str] = None,
+                host: str = "127.0.0.1", port: int = 8765) -> None:
+    """
+    Accept connections until cancelled (e.g. by Ctrl+C).
+
+    Args:
+        server: Query server holding the grids and the worker pool
+        unix_path: Listen on this Unix socket instead of TCP
+        host: TCP address to bind
+        port: TCP port to bind
+    """
+    if unix_path:
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)
+        listener = await asyncio.start_unix_server(server.handle_connection, path=unix_path)
+        where = unix_path
+    else:
+        listener = await asyncio.start_server(server.handle_connection, host, port)
+        where = f"{host}:{port}"
+
+    print(f"Listening on {where} with {len(server.grids)} grid(s) loaded", file=sys.stderr)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        if unix_path and os.path.exists(unix_path):
+            os.unlink(unix_path)
+
+
+def main() -> None:
+
+    from algorithms_used import ALGORITHMS
+
+    parser = argparse.ArgumentParser(description="Serve path queries over a local socket (JSON lines).")
+    parser.add_argument("--unix", default=None, help="Unix socket path (TCP when omitted)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--map", action="append", default=[], metavar="NAME=PATH",
+                        help="Preload a map file saved with mapfile.py (repeatable)")
+    args = parser.parse_args()
+
+    server = QueryServer(ALGORITHMS, args.workers)
+    try:
+        for item in args.map:
+            name, separator, path = item.partition("=")
+            if not separator:
+                parser.error(f"--map expects NAME=PATH, got {item!r}")
+            server.add_grid(name, load_grid(path))
+        asyncio.run(serve(server, args.unix, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import random
+
+from grid import Grid
+from algorithms_used import BFS, HierarchicalSearch, NullRecorder
+
+
+def make_grid(width, height, walls, seed):
+    grid = Grid(width, height, (0, 0), (width - 1, height - 1), 0.0)
+    grid.add_walls_randomly(walls, random.Random(seed))
+    return grid
+
+
+def assert_valid_path(grid, path):
+    assert path[0] == grid.start and path[-1] == grid.target
+    for (x, y), (nx, ny) in zip(path, path[1:]):
+        assert max(abs(nx - x), abs(ny - y)) == 1
+        assert not grid.is_blocked((nx, ny))
+
+
+def test_hierarchical_matches_bfs_reachability():
+    for seed in range(20):
+        grid = make_grid(60, 45, 700, seed)
+        expected = BFS(grid, recorder=NullRecorder()).search()
+        result = HierarchicalSearch(grid, cluster_size=16).search()
+        assert result.found == expected.found
+        if result.found:
+            assert_valid_path(grid, result.path)
+            assert len(result.path) >= len(expected.path)
+
+
+def test_hierarchical_single_cluster():
+    grid = make_grid(12, 12, 20, 3)
+    expected = BFS(grid, recorder=NullRecorder()).search()
+    result = HierarchicalSearch(grid, cluster_size=32).search()
+    assert result.found == expected.found
+    if result.found:
+        assert_valid_path(grid, result.path)
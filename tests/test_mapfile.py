@@ -0,0 +1,55 @@
+import random
+
+from grid import Grid
+from mapfile import MappedGrid, create_map, save_grid
+from algorithms_used import BFS, JPS, CompactBFS, HierarchicalSearch, NullRecorder
+
+
+def make_grid(width, height, walls, seed):
+    grid = Grid(width, height, (0, 0), (width - 1, height - 1), 0.0)
+    grid.add_walls_randomly(walls, random.Random(seed))
+    return grid
+
+
+def test_mapped_grid_searches_match_grid(tmp_path):
+    for seed in range(10):
+        grid = make_grid(37, 29, 300, seed)
+        path = tmp_path / f"map{seed}.grid"
+        save_grid(grid, str(path))
+        expected = BFS(grid, recorder=NullRecorder()).search()
+        with MappedGrid(str(path)) as mapped:
+            assert set(mapped.walls) == grid.walls
+            for search in (BFS, CompactBFS, JPS, HierarchicalSearch):
+                result = search(mapped).search()
+                assert result.found == expected.found
+                if result.found and search is not HierarchicalSearch:
+                    assert len(result.path) == len(expected.path)
+
+
+def test_mapped_wall_mask_matches_grid(tmp_path):
+    rng = random.Random(4)
+    grid = make_grid(45, 23, 400, 4)
+    path = tmp_path / "mask.grid"
+    save_grid(grid, str(path))
+    with MappedGrid(str(path)) as mapped:
+        for _ in range(100):
+            x0, x1 = sorted(rng.sample(range(grid.width + 1), 2))
+            y0, y1 = sorted(rng.sample(range(grid.height + 1), 2))
+            assert mapped.wall_mask(x0, y0, x1, y1) == grid.wall_mask(x0, y0, x1, y1)
+
+
+def test_add_walls_randomly_places_count_walls(tmp_path):
+    for seed in range(10):
+        rng = random.Random(seed)
+        path = tmp_path / f"walls{seed}.grid"
+        create_map(str(path), 20, 15, start=(0, 0), target=(19, 14))
+        with MappedGrid(str(path), writable=True) as mapped:
+            grid = Grid(20, 15, (0, 0), (19, 14), 0.0)
+            for count in (50, 150, 200):
+                before = len(mapped.walls), len(grid.walls)
+                mapped.add_walls_randomly(count, rng)
+                grid.add_walls_randomly(count, rng)
+                assert len(mapped.walls) - before[0] == len(grid.walls) - before[1]
+            # Every cell but the endpoints ends up walled on both grid types
+            assert len(mapped.walls) == len(grid.walls) == 20 * 15 - 2
+            assert not mapped.is_blocked(mapped.start) and not mapped.is_blocked(mapped.target)
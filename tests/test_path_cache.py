@@ -0,0 +1,56 @@
+from grid import Grid
+from path_cache import PathCache
+from algorithms_used import BFS
+
+
+def make_grid():
+    grid = Grid(20, 20, (0, 0), (19, 19), 0.0)
+    for y in range(15):
+        grid.add_wall(10, y)
+    return grid
+
+
+def cached_search(cache, grid):
+    result = cache.get(grid, "BFS")
+    if result is None:
+        result = cache.put(grid, "BFS", BFS(grid).search(), grid.version)
+    return result
+
+
+def test_unchanged_grid_is_served_from_cache():
+    grid = make_grid()
+    cache = PathCache()
+    first = cached_search(cache, grid)
+    assert cached_search(cache, grid) is first
+    assert cache.stats()["hits"] == 1
+
+
+def test_walls_off_the_path_keep_the_result():
+    grid = make_grid()
+    cache = PathCache()
+    first = cached_search(cache, grid)
+    off_path = next((x, 0) for x in range(20) if (x, 0) not in first.path and not grid.is_blocked((x, 0)))
+    grid.add_wall(*off_path)
+    assert cached_search(cache, grid) is first
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_walls_on_the_path_force_a_new_search():
+    grid = make_grid()
+    cache = PathCache()
+    first = cached_search(cache, grid)
+    grid.add_wall(*first.path[len(first.path) // 2])
+    second = cached_search(cache, grid)
+    assert second is not first
+    assert BFS(grid).search().path_length == second.path_length
+
+
+def test_entry_limit_evicts_least_recent():
+    grid = make_grid()
+    cache = PathCache(max_entries=2)
+    for target in ((19, 19), (18, 19), (17, 19)):
+        cache.put(grid, "BFS", BFS(grid).search(), grid.version, target=target)
+    assert len(cache) == 2
+    assert cache.get(grid, "BFS", target=(19, 19)) is None
+    assert cache.get(grid, "BFS", target=(17, 19)) is not None
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,143 @@
+import random
+
+import pytest
+
+from grid import Grid
+from algorithms_used import (ALGORITHMS, BFS, UCS, BatchBFS, BidirectionalSearch, DStarLite,
+                             LandmarkTable, NullRecorder, distance_field,
+                             wavefront_distance_field)
+from algorithms_used.wavefront import NUMPY_AVAILABLE
+
+# Registry searches that return a shortest hop path on unit-cost grids
+SHORTEST = ["UCS", "IDDFS", "BIDIRECTIONAL", "BFS_COMPACT", "UCS_COMPACT", "IDDFS_COMPACT",
+            "BIDIRECTIONAL_COMPACT", "BFS_WAVEFRONT", "DSTAR_LITE", "LANDMARK", "JPS"]
+
+# Registry searches that only have to agree with BFS on whether the target is reachable
+REACHABILITY = ["DFS", "DLS", "DFS_COMPACT", "DLS_COMPACT", "HIERARCHICAL"]
+
+
+def make_grid(width, height, walls, seed):
+    grid = Grid(width, height, (0, 0), (width - 1, height - 1), 0.0)
+    grid.add_walls_randomly(walls, random.Random(seed))
+    return grid
+
+
+def random_grids(count):
+    # Small grids of varied shape and wall density, a few of them without a path
+    for seed in range(count):
+        rng = random.Random(seed)
+        width, height = rng.randint(8, 30), rng.randint(8, 30)
+        yield make_grid(width, height, width * height * rng.choice((10, 25, 40)) // 100, seed)
+
+
+def bfs_path(grid, start=None, target=None):
+    sources = [start] if start is not None else None
+    targets = [target] if target is not None else None
+    return BFS(grid, recorder=NullRecorder(), sources=sources, targets=targets).search()
+
+
+def assert_valid_path(grid, path, start=None, target=None):
+    assert path[0] == (start or grid.start) and path[-1] == (target or grid.target)
+    for (x, y), (nx, ny) in zip(path, path[1:]):
+        assert max(abs(nx - x), abs(ny - y)) == 1
+        assert not grid.is_blocked((nx, ny))
+
+
+@pytest.mark.parametrize("name", SHORTEST)
+def test_shortest_searches_match_bfs(name):
+    if name == "BFS_WAVEFRONT" and not NUMPY_AVAILABLE:
+        pytest.skip("numpy is not installed")
+    for grid in random_grids(30):
+        expected = bfs_path(grid)
+        result = ALGORITHMS[name](grid).search()
+        assert result.found == expected.found
+        if result.found:
+            assert_valid_path(grid, result.path)
+            assert len(result.path) == len(expected.path)
+
+
+@pytest.mark.parametrize("name", REACHABILITY)
+def test_other_searches_match_bfs_reachability(name):
+    for grid in random_grids(30):
+        expected = bfs_path(grid)
+        result = ALGORITHMS[name](grid).search()
+        # DLS may stop at its depth limit, but never reports a path BFS cannot find
+        if name.startswith("DLS"):
+            assert not result.found or expected.found
+        else:
+            assert result.found == expected.found
+        if result.found:
+            assert_valid_path(grid, result.path)
+            assert len(result.path) >= len(expected.path)
+
+
+def test_batch_matches_bfs_per_query():
+    rng = random.Random(7)
+    for grid in random_grids(10):
+        free = [(x, y) for y in range(grid.height) for x in range(grid.width)
+                if not grid.is_blocked((x, y))]
+        # Few distinct sources, so several queries share one traversal
+        sources = rng.sample(free, 3)
+        queries = [(rng.choice(sources), rng.choice(free)) for _ in range(20)]
+        answered = set()
+        for query_index, result in BatchBFS(grid).search_many(queries):
+            start, target = queries[query_index]
+            expected = bfs_path(grid, start, target)
+            assert result.found == expected.found
+            if result.found:
+                assert_valid_path(grid, result.path, start, target)
+                assert len(result.path) == len(expected.path)
+            answered.add(query_index)
+        assert answered == set(range(len(queries)))
+
+
+def test_multi_source_searches_reach_nearest_target():
+    rng = random.Random(11)
+    for grid in random_grids(15):
+        free = [(x, y) for y in range(grid.height) for x in range(grid.width)
+                if not grid.is_blocked((x, y))]
+        sources, targets = rng.sample(free, 3), rng.sample(free, 3)
+        field = distance_field(grid, sources)
+        reached = [field[grid.index(pos)] for pos in targets if field[grid.index(pos)] >= 0]
+        for search in (BFS, UCS, BidirectionalSearch):
+            result = search(grid, recorder=NullRecorder(), sources=sources, targets=targets).search()
+            assert result.found == bool(reached)
+            if result.found:
+                assert result.path[0] in sources and result.path[-1] in targets
+                assert len(result.path) - 1 == min(reached)
+
+
+def test_distance_fields_match_bfs():
+    for grid in random_grids(15):
+        expected = bfs_path(grid)
+        field = distance_field(grid, [grid.start])
+        hops = field[grid.index(grid.target)]
+        assert hops == (len(expected.path) - 1 if expected.found else -1)
+        if NUMPY_AVAILABLE:
+            assert list(wavefront_distance_field(grid, [grid.start])) == list(field)
+
+
+def test_landmark_distance_matches_bfs():
+    rng = random.Random(5)
+    for grid in random_grids(10):
+        table = LandmarkTable(grid, count=4)
+        free = [(x, y) for y in range(grid.height) for x in range(grid.width)
+                if not grid.is_blocked((x, y))]
+        for _ in range(20):
+            a, b = rng.choice(free), rng.choice(free)
+            expected = bfs_path(grid, a, b)
+            assert table.distance(a, b) == (len(expected.path) - 1 if expected.found else None)
+
+
+def test_dstar_lite_paths_stay_valid_with_obstacles():
+    for grid in random_grids(15):
+        grid.dynamic_spawn_probability = 0.3
+        expected = bfs_path(grid)
+        result = DStarLite(grid).search()
+        # Obstacles can only cut routes off, never open a new one
+        assert not result.found or expected.found
+        if result.found:
+            assert result.path[0] == grid.start and result.path[-1] == grid.target
+            for (x, y), (nx, ny) in zip(result.path, result.path[1:]):
+                assert max(abs(nx - x), abs(ny - y)) == 1
+        grid.clear_dynamic_obstacles()